@@ -0,0 +1,106 @@
+# app/bot/admission.py
+import asyncio
+import functools
+import logging
+from typing import Callable, Dict, Tuple, Union
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from app.services.ratelimit import TokenBucket
+
+log = logging.getLogger(__name__)
+
+# 명령 분류
+LLM = "llm"      # OpenAI 호출 (/add, 자유 입력)
+WRITE = "write"  # SQLite 쓰기 (삭제/알림 설정 등)
+READ = "read"    # 조회/메뉴
+
+# (사용자 초당, 사용자 버스트, 전체 초당, 전체 버스트)
+Limit = Tuple[float, float, float, float]
+
+DEFAULT_LIMITS: Dict[str, Limit] = {
+    LLM: (0.2, 3, 2, 10),
+    WRITE: (2, 10, 50, 100),
+    READ: (3, 15, 100, 200),
+}
+
+REJECT_TEXT = "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
+
+
+class AdmissionController:
+    """
+    명령 분류(llm/write/read)별 사용자/전체 토큰 버킷으로 유입 제한
+
+    - 두 버킷 모두 max_wait_sec 안에 토큰이 생기면 예약(reserve) 후 그만큼 기다렸다 통과
+    - 그보다 오래 기다려야 하면 토큰을 쓰지 않고 바로 거절 메시지
+    - admitted/delayed/rejected 카운터 (분류별)
+    """
+
+    def __init__(self, limits: Dict[str, Limit] = None, max_wait_sec: float = 2.0,
+                 max_users: int = 10000):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.max_wait_sec = max_wait_sec
+        self.max_users = max_users
+        self._global = {k: TokenBucket(v[2], v[3]) for k, v in self.limits.items()}
+        self._users: Dict[Tuple[str, int], TokenBucket] = {}
+        self.admitted = {k: 0 for k in self.limits}
+        self.delayed = {k: 0 for k in self.limits}
+        self.rejected = {k: 0 for k in self.limits}
+
+    def _user_bucket(self, klass: str, user_id: int) -> TokenBucket:
+        key = (klass, user_id)
+        b = self._users.get(key)
+        if b is None:
+            if len(self._users) > self.max_users:
+                # 가득 찬(한동안 안 쓴) 버킷은 새로 만들어도 같으므로 정리
+                self._users = {k: v for k, v in self._users.items() if not v.is_full()}
+            rate, burst = self.limits[klass][:2]
+            b = self._users[key] = TokenBucket(rate, burst)
+        return b
+
+    async def admit(self, user_id: int, klass: str) -> bool:
+        user = self._user_bucket(klass, user_id)
+        glob = self._global[klass]
+        if max(user.wait_time(), glob.wait_time()) > self.max_wait_sec:
+            self.rejected[klass] += 1
+            return False
+        wait = max(user.reserve(), glob.reserve())
+        if wait > 0:
+            self.delayed[klass] += 1
+            await asyncio.sleep(wait)
+        self.admitted[klass] += 1
+        return True
+
+    def guard(self, klass: Union[str, Callable[[], str]], fn):
+        """
+        등록용 래퍼: 통과하면 fn 실행, 아니면 거절 메시지
+        klass 가 함수면 요청마다 호출해 분류 결정 (예: LLM 사용 가능할 때만 LLM)
+        """
+
+        @functools.wraps(fn)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            user = update.effective_user
+            k = klass() if callable(klass) else klass
+            if user is not None and not await self.admit(user.id, k):
+                await reject(update)
+                return
+            return await fn(update, context)
+
+        return wrapper
+
+    def stats(self) -> dict:
+        return {
+            "admitted": dict(self.admitted),
+            "delayed": dict(self.delayed),
+            "rejected": dict(self.rejected),
+            "tracked_users": len(self._users),
+        }
+
+
+async def reject(update: Update):
+    if update.callback_query is not None:
+        await update.callback_query.answer(REJECT_TEXT, show_alert=False)
+    elif update.effective_message is not None:
+        await update.effective_message.reply_text(REJECT_TEXT)
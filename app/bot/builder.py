@@ -1,14 +1,28 @@
+import asyncio
+
 from telegram.ext import Application
 
+from app.services.outbox import Outbox, PRIORITY_BULK, PRIORITY_NORMAL
+
 class PTBSender:
-    def __init__(self, app: Application):
+    def __init__(self, app: Application, outbox: Outbox = None):
         self.app = app
+        self.outbox = outbox
+
+    async def send(self, chat_id, text, priority=PRIORITY_NORMAL, coalesce=False, **kwargs):
+        """전송 결과 Future(bool) 반환 — Outbox 를 쓰면 실제 전송(또는 포기) 시점에 완료"""
+        if self.outbox is None:
+            await self.app.bot.send_message(chat_id, text, **kwargs)
+            done = asyncio.get_running_loop().create_future()
+            done.set_result(True)
+            return done
+        return self.outbox.put(chat_id, text, priority=priority, coalesce=coalesce, **kwargs)
 
     async def send_daily(self, chat_id, date, items):
         if not items:
-            await self.app.bot.send_message(chat_id, f"{date} 일정 없음")
+            await self.send(chat_id, f"{date} 일정 없음", priority=PRIORITY_BULK)
         else:
             lines = [f"{date} 일정"]
-            for sid,title,desc,dt,tm in items:
+            for sid, title, _desc, _dt, tm in items:
                 lines.append(f"- [{sid}] {title} ({tm or '시간 미정'})")
-            await self.app.bot.send_message(chat_id, "\n".join(lines))
+            await self.send(chat_id, "\n".join(lines), priority=PRIORITY_BULK)
@@ -0,0 +1,176 @@
+"""
+callback_data 코덱 + 라우터
+
+형식 (v1): "~1" + 액션코드(1글자) + base64url(인자)
+  - 인자: int → zigzag varint (태그 0), str → 길이 varint + UTF-8 (태그 1)
+  - 예) rset(1234, 30) → "~1CyCZ4" (7바이트) / 텔레그램 한도 64바이트 초과 시 ValueError
+  - "~" 로 시작하지 않는 예전 버튼("rmenu:12", "rem:daily:09:00:오늘 일정" 등)은 _LEGACY 로 해석
+"""
+import base64
+from typing import Awaitable, Callable, Dict, Tuple, Union
+
+Arg = Union[int, str]
+
+VERSION = "1"
+_PREFIX = "~" + VERSION
+MAX_BYTES = 64  # 텔레그램 callback_data 한도
+
+# ====== 액션 ======
+MENU = "menu"
+ADD_HINT = "add_hint"
+LIST = "list"
+TODAY = "today"
+REMIND_PRESETS = "remind_presets"
+REMINDERS = "reminders"
+RMENU = "rmenu"
+RSET = "rset"
+RDEL = "rdel"
+RDELALL = "rdelall"
+DEL = "del"
+VIEW = "view"
+REM_DAILY = "rem"
+REM_WEEKLY = "remw"
+CONFIRM_DELETE_ALL = "confirm_delete_all"
+DO_DELETE_ALL = "do_delete_all"
+SUGGEST_ADD = "suggest_add"
+SEARCH = "search"
+WEEK = "week"
+MONTH = "month"
+DAY = "day"
+
+# 액션 코드는 한 번 배포되면 바꾸지 말 것 (기존 메시지의 버튼이 깨짐). 새 액션은 뒤에 추가.
+_CODES = {
+    MENU: "a", ADD_HINT: "b", RMENU: "c", RSET: "C", RDEL: "d", RDELALL: "D",
+    DEL: "e", VIEW: "f", LIST: "g", TODAY: "h", REMIND_PRESETS: "i", REMINDERS: "j",
+    REM_DAILY: "k", REM_WEEKLY: "K", CONFIRM_DELETE_ALL: "l", DO_DELETE_ALL: "L",
+    SUGGEST_ADD: "m", SEARCH: "n", WEEK: "o", MONTH: "p", DAY: "q",
+}
+_ACTIONS = {code: action for action, code in _CODES.items()}
+
+# 프리셋 알림 문구 (버튼에는 인덱스만 실음)
+PRESET_TEXTS = ("오늘 일정", "이번주 일정")
+
+
+# ====== varint ======
+def _put_varint(out: bytearray, n: int):
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return
+
+
+def _get_varint(buf: bytes, i: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = buf[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return n, i
+        shift += 7
+
+
+def encode(action: str, *args: Arg) -> str:
+    out = bytearray()
+    for a in args:
+        if isinstance(a, int):
+            zz = (a << 1) if a >= 0 else ((-a << 1) - 1)
+            _put_varint(out, zz << 1)
+        else:
+            raw = a.encode("utf-8")
+            _put_varint(out, (len(raw) << 1) | 1)
+            out += raw
+    data = _PREFIX + _CODES[action] + base64.urlsafe_b64encode(bytes(out)).decode().rstrip("=")
+    if len(data.encode()) > MAX_BYTES:
+        raise ValueError(f"callback_data too long ({len(data.encode())} bytes): {action}")
+    return data
+
+
+def decode(data: str) -> Tuple[str, Tuple[Arg, ...]]:
+    if not data.startswith("~"):
+        return _decode_legacy(data)
+    if not data.startswith(_PREFIX) or len(data) < len(_PREFIX) + 1:
+        raise ValueError(f"unsupported callback version: {data[:3]!r}")
+    action = _ACTIONS.get(data[len(_PREFIX)])
+    if action is None:
+        raise ValueError(f"unknown callback action: {data!r}")
+    body = data[len(_PREFIX) + 1:]
+    buf = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+    args, i = [], 0
+    while i < len(buf):
+        v, i = _get_varint(buf, i)
+        if v & 1:
+            n = v >> 1
+            args.append(buf[i:i + n].decode("utf-8"))
+            i += n
+        else:
+            zz = v >> 1
+            args.append((zz >> 1) if not zz & 1 else -((zz + 1) >> 1))
+    return action, tuple(args)
+
+
+# ====== 예전 형식 ("prefix:...") ======
+def _ints(rest: str) -> Tuple[int, ...]:
+    return tuple(int(x) for x in rest.split(":"))
+
+
+def _legacy_rem(rest: str):
+    _mode, hm_h, hm_m, msg = rest.split(":", 3)  # daily:09:00:오늘 일정
+    return int(hm_h), int(hm_m), msg
+
+
+def _legacy_remw(rest: str):
+    wd, hh, mm, msg = rest.split(":", 3)  # 0:08:30:이번주 일정
+    return int(wd), int(hh), int(mm), msg
+
+
+_LEGACY_FIXED = {
+    "go:add": ADD_HINT, "go:list": LIST, "go:today": TODAY, "go:remind": REMIND_PRESETS,
+    "go:reminders": REMINDERS, "go:menu": MENU, "rlist": REMINDERS,
+    "confirm:delete_all": CONFIRM_DELETE_ALL, "do:delete_all": DO_DELETE_ALL,
+}
+_LEGACY_PREFIX = {
+    "rmenu": (RMENU, _ints), "rset": (RSET, _ints), "rdel": (RDEL, _ints),
+    "rdelall": (RDELALL, _ints), "del": (DEL, _ints), "view": (VIEW, _ints),
+    "suggest_add": (SUGGEST_ADD, _ints), "rem": (REM_DAILY, _legacy_rem),
+    "remw": (REM_WEEKLY, _legacy_remw),
+}
+
+
+def _decode_legacy(data: str) -> Tuple[str, Tuple[Arg, ...]]:
+    action = _LEGACY_FIXED.get(data)
+    if action is not None:
+        return action, ()
+    prefix, _, rest = data.partition(":")
+    entry = _LEGACY_PREFIX.get(prefix)
+    if entry is None:
+        raise ValueError(f"unknown callback data: {data!r}")
+    action, parse = entry
+    return action, parse(rest)
+
+
+# ====== 라우터 ======
+Handler = Callable[..., Awaitable[None]]
+
+
+class CallbackRouter:
+    """액션 → 핸들러 dict 조회로 O(1) 디스패치. 핸들러는 (update, context, *args) 로 호출"""
+
+    def __init__(self):
+        self._routes: Dict[str, Handler] = {}
+
+    def register(self, action: str, handler: Handler):
+        if action not in _CODES:
+            raise KeyError(f"unregistered action code: {action}")
+        self._routes[action] = handler
+
+    def resolve(self, data: str) -> Tuple[str, Handler, Tuple[Arg, ...]]:
+        action, args = decode(data)
+        handler = self._routes.get(action)
+        if handler is None:
+            raise ValueError(f"no handler for action: {action}")
+        return action, handler, args
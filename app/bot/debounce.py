@@ -0,0 +1,87 @@
+# app/bot/debounce.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+ParseFn = Callable[[int, Any, str], Awaitable[Any]]
+CommitFn = Callable[[int, Any, Any], Awaitable[None]]
+
+
+class _Batch:
+    __slots__ = ("parts", "message", "task")
+
+    def __init__(self, message):
+        self.parts: List[str] = []
+        self.message = message
+        self.task: Optional[asyncio.Task] = None
+
+
+class TextDebouncer:
+    """
+    자유 입력 메시지 디바운스
+
+    - 사용자별로 window_sec 동안 이어서 들어온 메시지 조각을 모아 한 번만 파싱 (LLM 호출 1회)
+    - 대기 중이거나 파싱 중에 새 조각이 오면 진행 중인 작업을 취소하고 합친 텍스트로 다시 대기
+      (스레드에서 돌던 LLM 요청 자체는 끝까지 가지만 결과는 버림)
+    - 파싱이 끝나 commit 단계에 들어간 배치는 더 이상 취소하지 않음 → 새 조각은 새 배치로
+    - max_parts 조각이 모이면 대기 없이 바로 파싱
+    - parse(user_id, message, text) 가 None 을 반환하면 (유입 제한 거절 등) commit 없이 종료
+    """
+
+    def __init__(self, parse: ParseFn, commit: CommitFn, window_sec: float = 1.5,
+                 max_parts: int = 8):
+        self._parse = parse
+        self._commit = commit
+        self.window_sec = window_sec
+        self.max_parts = max_parts
+        self._pending: Dict[int, _Batch] = {}
+        self.fragments = 0
+        self.parses = 0
+        self.superseded = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def feed(self, user_id: int, message, text: str):
+        self.fragments += 1
+        batch = self._pending.get(user_id)
+        if batch is None:
+            batch = self._pending[user_id] = _Batch(message)
+        elif batch.task is not None and not batch.task.done():
+            batch.task.cancel()
+            self.superseded += 1
+        batch.parts.append(text)
+        batch.message = message  # 답장은 마지막 조각에
+        delay = 0.0 if len(batch.parts) >= self.max_parts else self.window_sec
+        batch.task = asyncio.create_task(self._run(user_id, batch, delay))
+
+    def cancel(self, user_id: int) -> bool:
+        batch = self._pending.pop(user_id, None)
+        if batch is None:
+            return False
+        if batch.task is not None:
+            batch.task.cancel()
+        return True
+
+    async def _run(self, user_id: int, batch: _Batch, delay: float):
+        if delay:
+            await asyncio.sleep(delay)
+        self.parses += 1
+        try:
+            parsed = await self._parse(user_id, batch.message, " ".join(batch.parts))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            parsed = None
+            log.exception("free-text parse failed for user %s", user_id)
+        # 여기부터는 취소 불가: 다음 조각은 새 배치로 받음
+        if self._pending.get(user_id) is batch:
+            del self._pending[user_id]
+        if parsed is None:
+            return
+        try:
+            await self._commit(user_id, batch.message, parsed)
+        except Exception:
+            log.exception("free-text commit failed for user %s", user_id)
@@ -1,16 +1,23 @@
 # app/bot/handlers.py
 from __future__ import annotations
 
+import asyncio
 import datetime
-from telegram import (
-    Update,
-    InlineKeyboardMarkup,
-    InlineKeyboardButton,
-    ReplyKeyboardMarkup,
-    KeyboardButton,
-)
+import functools
+import re
+import weakref
+from telegram import Update
 from telegram.ext import ContextTypes
 
+from app.bot import callbacks as cb
+from app.bot.admission import LLM, READ, REJECT_TEXT, WRITE, reject
+from app.bot import keyboards as kbs
+from app.bot.callbacks import CallbackRouter
+from app.bot.debounce import TextDebouncer
+from app.bot.keyboards import suggestion_keyboard
+from app.bot.render import ViewCache
+from app.services.timeutil import is_valid_ymd
+
 
 def _dday_text(date_str: str) -> str:
     today = datetime.date.today()
@@ -39,47 +46,120 @@ def _offset_label(offset_minutes: int) -> str:
     return f"{offset_minutes}분 전"
 
 
+_WEEKDAYS = "월화수목금토일"
+
+
+def _ymd_key(d: datetime.date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _key_date(key: int) -> datetime.date:
+    return datetime.date(key // 10000, key // 100 % 100, key % 100)
+
+
+def _day_label(d: datetime.date) -> str:
+    return f"{d.month:02d}/{d.day:02d}({_WEEKDAYS[d.weekday()]})"
+
+
+def _summary_text(s) -> str:
+    more = f" 외 {s.count - 1}건" if s.count > 1 else ""
+    return f"{s.first_time or '시간 미정'} {s.first_title}{more}"
+
+
+def _chunks(items, n: int):
+    return [tuple(items[i:i + n]) for i in range(0, len(items), n)]
+
+
+_SEARCH_PAGE = 5
+_DATE_RANGE = re.compile(r"^(\d{4}-\d{2}-\d{2})?~(\d{4}-\d{2}-\d{2})?$")
+
+
+def _parse_search(text: str):
+    """'검색어 [YYYY-MM-DD~YYYY-MM-DD]' → (단어 목록, 시작일, 종료일). 날짜 하나만 주면 그날만"""
+    terms, start, end = [], None, None
+    for tok in text.split():
+        m = _DATE_RANGE.match(tok)
+        if m and (m.group(1) or m.group(2)) and all(is_valid_ymd(d) for d in m.groups() if d):
+            start, end = m.group(1) or start, m.group(2) or end
+        elif len(tok) == 10 and is_valid_ymd(tok):
+            start = end = tok
+        else:
+            terms.append(tok)
+    return terms, start, end
+
+
+# 콜백 액션별 유입 제한 분류 (없으면 WRITE)
+_CALLBACK_CLASS = {
+    cb.MENU: READ, cb.ADD_HINT: READ, cb.LIST: READ, cb.TODAY: READ,
+    cb.REMIND_PRESETS: READ, cb.REMINDERS: READ, cb.RMENU: READ, cb.VIEW: READ,
+    cb.CONFIRM_DELETE_ALL: READ, cb.SEARCH: READ, cb.WEEK: READ, cb.MONTH: READ, cb.DAY: READ,
+}
+
+
 class Handlers:
-    def __init__(self, repo, ai, kparser, reminder):
+    def __init__(self, repo, ai, kparser, reminder, suggester=None, cache=None, views=None,
+                 text_debounce_sec: float = 1.5, admission=None, profiler=None,
+                 admin_ids=()):
         self.repo = repo
         self.ai = ai
         self.kparser = kparser
         self.reminder = reminder
+        self.suggester = suggester
+        self.cache = cache
+        self.views = views or ViewCache()
+        self.admission = admission
+        self.profiler = profiler
+        self.admin_ids = frozenset(admin_ids)
+        self._renderers = {
+            "list": self._render_list,
+            "today": self._render_today,
+            "reminders": self._render_reminders,
+        }
+        self.router = CallbackRouter()
+        self._register_callbacks()
+        # 사용자별 직렬화 락 (사용 중인 락만 유지)
+        self._user_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self.debouncer = TextDebouncer(
+            self._parse_free_text, self._commit_free_text, window_sec=text_debounce_sec
+        )
+
+    # ====== 동시 처리: 사용자별 순서 보장 ======
+    def serialized(self, fn):
+        """
+        등록용 래퍼: 서로 다른 사용자의 업데이트는 동시에, 같은 사용자의 업데이트는 도착 순서대로 처리
+        (핸들러 내부에서 self.menu 등을 직접 호출하는 경로는 락을 다시 잡지 않음)
+        """
+
+        @functools.wraps(fn)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            user = update.effective_user
+            if user is None:
+                return await fn(update, context)
+            async with self._lock_for(user.id):
+                return await fn(update, context)
+
+        return wrapper
+
+    def _lock_for(self, user_id: int) -> asyncio.Lock:
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._user_locks[user_id] = lock
+        return lock
 
     # ====== 메뉴 (ReplyKeyboard + InlineKeyboard) ======
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        reply_kb = ReplyKeyboardMarkup(
-            [
-                [KeyboardButton("/add"), KeyboardButton("/list")],
-                [KeyboardButton("/today"), KeyboardButton("/remind")],
-                [KeyboardButton("/reminders"), KeyboardButton("/delete_all")],
-                [KeyboardButton("/menu")],
-            ],
-            resize_keyboard=True,
-        )
-        await update.message.reply_text("원하는 작업을 선택하세요 👇", reply_markup=reply_kb)
+        await update.message.reply_text("원하는 작업을 선택하세요 👇", reply_markup=kbs.REPLY_MENU)
         await self.menu(update, context)
 
     async def menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        kb = InlineKeyboardMarkup(
-            [
-                [InlineKeyboardButton("➕ 일정 추가", callback_data="go:add")],
-                [
-                    InlineKeyboardButton("📋 전체 일정", callback_data="go:list"),
-                    InlineKeyboardButton("📅 오늘 일정", callback_data="go:today"),
-                ],
-                [
-                    InlineKeyboardButton("🔔 알림 프리셋", callback_data="go:remind"),
-                    InlineKeyboardButton("⏰ 알림 목록", callback_data="go:reminders"),
-                ],
-                [InlineKeyboardButton("🧹 전체 삭제", callback_data="confirm:delete_all")],
-            ]
-        )
         msg = "메뉴를 선택하세요:"
         if getattr(update, "message", None):
-            await update.message.reply_text(msg, reply_markup=kb)
+            await update.message.reply_text(msg, reply_markup=kbs.MAIN_MENU)
         else:
-            await update.effective_message.reply_text(msg, reply_markup=kb)
+            await update.effective_message.reply_text(msg, reply_markup=kbs.MAIN_MENU)
 
     # ====== 일정 추가 (/add: 항상 AI 경유) ======
     async def add(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -90,79 +170,191 @@ class Handlers:
             return
 
         text = " ".join(context.args)
+        parsed = await self._parse_schedule(text)
+        await self._save_parsed(update.effective_user.id, update.message, parsed)
+
+    async def _parse_schedule(self, text: str):
+        """(title, description, date, time, from_ai) 반환"""
         if self.ai.available():
-            sch = self.ai.parse_with_ai(text)
-            sid = self.repo.add(
-                update.effective_user.id, sch.title, sch.description, sch.date, sch.time
-            )
-            dday = _dday_text(sch.date)
-            kb = InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton("🔔 알림 설정", callback_data=f"rmenu:{sid}"),
-                        InlineKeyboardButton("🗑 되돌리기", callback_data=f"del:{sid}"),
-                    ]
-                ]
-            )
-            await update.message.reply_text(
-                f"등록 완료: {sch.date} {sch.time or '시간 미정'} {sch.title} {dday}",
-                reply_markup=kb,
-            )
-        else:
-            title, time, date = self.kparser.parse(text)
-            sid = self.repo.add(update.effective_user.id, title, "", date, time)
-            dday = _dday_text(date)
-            kb = InlineKeyboardMarkup(
-                [[InlineKeyboardButton("🔔 알림 설정", callback_data=f"rmenu:{sid}")]]
-            )
-            await update.message.reply_text(
-                f"등록 완료: {date} {time or '시간 미정'} {title} {dday}",
-                reply_markup=kb,
-            )
+            # LLM 호출은 이벤트 루프를 막지 않도록 스레드에서
+            sch = await asyncio.to_thread(self.ai.parse_with_ai, text)
+            return sch.title, sch.description, sch.date, sch.time, True
+        title, time, date = self.kparser.parse(text)
+        return title, "", date, time, False
+
+    async def _save_parsed(self, user_id: int, message, parsed):
+        title, description, date, time, from_ai = parsed
+        sid = self.repo.add(user_id, title, description, date, time)
+        await message.reply_text(
+            f"등록 완료: {date} {time or '시간 미정'} {title} {_dday_text(date)}",
+            reply_markup=kbs.added_actions(sid, undo=from_ai),
+        )
 
-    async def list_all(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        rows = self.repo.list_all(update.effective_user.id)
+    # ====== 자유 입력 (명령어 없이 보낸 문장 → 디바운스 후 일정 추가) ======
+    async def on_text(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        text = (update.message.text or "").strip()
+        if text:
+            self.debouncer.feed(update.effective_user.id, update.message, text)
+
+    async def _parse_free_text(self, user_id: int, message, text: str):
+        # 조각마다가 아니라 합친 텍스트로 LLM 을 부르기 직전에 한 번만 유입 제한
+        if (self.ai.available() and self.admission is not None
+                and not await self.admission.admit(user_id, LLM)):
+            await message.reply_text(REJECT_TEXT)
+            return None
+        return await self._parse_schedule(text)
+
+    async def _commit_free_text(self, user_id: int, message, parsed):
+        # 디바운스 타이머에서 호출되므로 명령 처리와 같은 사용자 락을 잡음
+        async with self._lock_for(user_id):
+            await self._save_parsed(user_id, message, parsed)
+
+    # ====== 목록 화면 (렌더링 결과 캐시) ======
+    def _cached_view(self, user_id: int, view: str, page: int, render):
+        today = datetime.date.today()
+        key = (user_id, view, page, self.repo.version(user_id), today)
+        cached = self.views.get(key)
+        if cached is None:
+            text, markup = render()
+            self.views.put(key, text, markup)
+            return text, markup
+        return cached
+
+    def _render_list(self, user_id: int):
+        rows = self.repo.list_all(user_id, limit=10)
         if not rows:
-            await update.message.reply_text("등록된 일정이 없습니다.")
-            return
-
+            return "등록된 일정이 없습니다.", None
         lines, kb_rows = [], []
-        for sid, title, desc, dt, tm in rows[:10]:
-            dday = _dday_text(dt)
-            lines.append(f"• {dt} {tm or ''} {title} {dday}")
-            kb_rows.append(
-                [
-                    InlineKeyboardButton("🔔 알림", callback_data=f"rmenu:{sid}"),
-                    InlineKeyboardButton("ℹ️ 상세", callback_data=f"view:{sid}"),
-                    InlineKeyboardButton("🗑 삭제", callback_data=f"del:{sid}"),
-                ]
-            )
+        for row in rows:
+            lines.append(f"• {row.date} {row.time or ''} {row.title} {_dday_text(row.date)}")
+            kb_rows.append(kbs.list_row(row.id))
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
 
-        await update.message.reply_text(
-            "\n".join(lines), reply_markup=InlineKeyboardMarkup(kb_rows)
-        )
-
-    async def today(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    def _render_today(self, user_id: int):
         today_str = datetime.date.today().strftime("%Y-%m-%d")
-        rows = self.repo.today(update.effective_user.id, today_str)
+        rows = self.repo.today(user_id, today_str)
         if not rows:
-            await update.message.reply_text("오늘 일정 없음")
-            return
+            return "오늘 일정 없음", None
+        lines, kb_rows = [], []
+        for row in rows:
+            lines.append(f"• {row.time or ''} {row.title} {_dday_text(row.date)}")
+            kb_rows.append(kbs.today_row(row.id))
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
 
+    def _render_reminders(self, user_id: int):
+        rows = self.repo.list_reminders_detailed(user_id)
+        if not rows:
+            return "등록된 알림이 없습니다.", None
+        # 묶어서 보여주되, 각 알림별 관리 버튼 제공
         lines, kb_rows = [], []
-        for sid, title, desc, dt, tm in rows:
-            dday = _dday_text(dt)
-            lines.append(f"• {tm or ''} {title} {dday}")
-            kb_rows.append(
-                [
-                    InlineKeyboardButton("🔔 알림", callback_data=f"rmenu:{sid}"),
-                    InlineKeyboardButton("🗑 삭제", callback_data=f"del:{sid}"),
-                ]
+        for r in rows[:12]:
+            time_part = r.time or "시간 미정"
+            lines.append(
+                f"• {r.date} {time_part} {r.title} {_dday_text(r.date)}  —  [{_offset_label(r.offset_minutes)}]"
             )
-
-        await update.message.reply_text(
-            "\n".join(lines), reply_markup=InlineKeyboardMarkup(kb_rows)
+            kb_rows.append(kbs.reminder_row(r.id, r.schedule_id))
+        # 마지막 줄에 새로고침/닫기
+        kb_rows.append(kbs.REMINDER_LIST_FOOTER)
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
+
+    # ====== 기간 보기 (날짜별 집계 한 번의 쿼리 + 날짜 버튼으로 상세) ======
+    def _render_week(self, user_id: int, monday: datetime.date):
+        sunday = monday + datetime.timedelta(days=6)
+        by_date = {s.date: s for s in self.repo.day_summary(user_id, monday.isoformat(), sunday.isoformat())}
+        today = datetime.date.today()
+        total = sum(s.count for s in by_date.values())
+        lines = [f"🗓 {_day_label(monday)} ~ {_day_label(sunday)} ({total}건)"]
+        buttons = []
+        for i in range(7):
+            d = monday + datetime.timedelta(days=i)
+            s = by_date.get(d.isoformat())
+            mark = "  ← 오늘" if d == today else ""
+            lines.append(f"• {_day_label(d)} {_summary_text(s) if s else '-'}{mark}")
+            if s:
+                buttons.append(kbs.day_button(_ymd_key(d), f"{_day_label(d)} {s.count}"))
+        kb_rows = _chunks(buttons, 4)
+        kb_rows.append(kbs.range_nav(
+            cb.WEEK, _ymd_key(monday - datetime.timedelta(days=7)),
+            _ymd_key(monday + datetime.timedelta(days=7)), "지난주", "다음주",
+        ))
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
+
+    def _render_month(self, user_id: int, first: datetime.date):
+        nxt = (first + datetime.timedelta(days=32)).replace(day=1)
+        prev = (first - datetime.timedelta(days=1)).replace(day=1)
+        rows = self.repo.day_summary(
+            user_id, first.isoformat(), (nxt - datetime.timedelta(days=1)).isoformat()
         )
+        total = sum(s.count for s in rows)
+        lines = [f"🗓 {first.year}년 {first.month}월 ({total}건, {len(rows)}일)"]
+        buttons = []
+        for s in rows:
+            d = datetime.date.fromisoformat(s.date)
+            lines.append(f"• {_day_label(d)} {_summary_text(s)}")
+            buttons.append(kbs.day_button(_ymd_key(d), f"{d.day}일 {s.count}"))
+        if not rows:
+            lines.append("일정 없음")
+        kb_rows = _chunks(buttons, 5)
+        kb_rows.append(kbs.range_nav(
+            cb.MONTH, prev.year * 100 + prev.month, nxt.year * 100 + nxt.month,
+            f"{prev.month}월", f"{nxt.month}월",
+        ))
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
+
+    def _render_day(self, user_id: int, d: datetime.date):
+        rows = self.repo.today(user_id, d.isoformat())
+        lines = [f"📅 {d.isoformat()} ({_WEEKDAYS[d.weekday()]}) {_dday_text(d.isoformat())}"]
+        kb_rows = []
+        for row in rows:
+            lines.append(f"• {row.time or '시간 미정'} {row.title}")
+            kb_rows.append(kbs.today_row(row.id))
+        if not rows:
+            lines.append("일정 없음")
+        kb_rows.append(kbs.back_to_week(_ymd_key(d - datetime.timedelta(days=d.weekday()))))
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
+
+    def _range_view(self, user_id: int, view: str, key: int):
+        """key 0 = 이번 주/이번 달"""
+        today = datetime.date.today()
+        if view == "week":
+            monday = _key_date(key) if key else today - datetime.timedelta(days=today.weekday())
+            return self._cached_view(user_id, view, _ymd_key(monday), lambda: self._render_week(user_id, monday))
+        if view == "month":
+            first = datetime.date(key // 100, key % 100, 1) if key else today.replace(day=1)
+            return self._cached_view(
+                user_id, view, first.year * 100 + first.month, lambda: self._render_month(user_id, first)
+            )
+        d = _key_date(key)
+        return self._cached_view(user_id, view, key, lambda: self._render_day(user_id, d))
+
+    async def week(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """/week [YYYY-MM-DD]: 해당 날짜가 속한 주 (기본 이번 주)"""
+        key = 0
+        if context.args and is_valid_ymd(context.args[0]):
+            d = datetime.date.fromisoformat(context.args[0])
+            key = _ymd_key(d - datetime.timedelta(days=d.weekday()))
+        text, markup = self._range_view(update.effective_user.id, "week", key)
+        await update.message.reply_text(text, reply_markup=markup)
+
+    async def month(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """/month [YYYY-MM]: 해당 달 (기본 이번 달)"""
+        key = 0
+        if context.args and is_valid_ymd(context.args[0] + "-01"):
+            y, m = context.args[0].split("-")[:2]
+            key = int(y) * 100 + int(m)
+        text, markup = self._range_view(update.effective_user.id, "month", key)
+        await update.message.reply_text(text, reply_markup=markup)
+
+    async def _reply_view(self, message, user_id: int, view: str):
+        render = self._renderers[view]
+        text, markup = self._cached_view(user_id, view, 0, lambda: render(user_id))
+        await message.reply_text(text, reply_markup=markup)
+
+    async def list_all(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        await self._reply_view(update.message, update.effective_user.id, "list")
+
+    async def today(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        await self._reply_view(update.message, update.effective_user.id, "today")
 
     # ====== 삭제 ======
     async def delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -176,7 +368,7 @@ class Handlers:
             return
 
         try:
-            self.repo.delete_reminders_for_schedule(update.effective_user.id, sid)
+            self.reminder.delete_for_schedule(update.effective_user.id, sid)
         except Exception:
             pass
 
@@ -184,30 +376,68 @@ class Handlers:
         await update.message.reply_text("삭제 완료" if ok else "삭제 실패/권한 없음")
 
     async def delete_all(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        self.reminder.forget_user(update.effective_user.id)
         cnt = self.repo.delete_all(update.effective_user.id)
         await update.message.reply_text(f"전체 삭제 완료 ({cnt}건)")
 
+    # ====== 빈 시간 제안 (/suggest [분] [제목]) ======
+    async def suggest(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        args = list(context.args or [])
+        duration = 60
+        if args and args[0].rstrip("분").isdigit():
+            duration = max(10, min(int(args.pop(0).rstrip("분")), 720))
+        title = " ".join(args).strip() or "새 일정"
+
+        suggestions = self.suggester.suggest(update.effective_user.id, title, duration)
+        if not suggestions:
+            await update.message.reply_text("추천할 빈 시간이 없습니다.")
+            return
+
+        lines = [f"💡 '{title}' ({duration}분) 추천 시간"]
+        for i, sg in enumerate(suggestions, 1):
+            dday = _dday_text(sg.suggested_date)
+            lines.append(f"{i}) {sg.suggested_date} {sg.suggested_time} {dday}")
+
+        sent = await update.message.reply_text("\n".join(lines))
+        self.cache.put(sent.chat_id, sent.message_id, suggestions)
+        await sent.edit_reply_markup(
+            reply_markup=suggestion_keyboard(sent.message_id, len(suggestions))
+        )
+
+    # ====== 검색 (/search 검색어 [YYYY-MM-DD~YYYY-MM-DD]) ======
+    def _render_search(self, user_id: int, query: str, page: int):
+        terms, start, end = _parse_search(query)
+        rows = self.repo.search(
+            user_id, terms, start, end, limit=_SEARCH_PAGE + 1, offset=page * _SEARCH_PAGE
+        )
+        has_next = len(rows) > _SEARCH_PAGE
+        if not rows:
+            return (f"🔎 '{query}' 검색 결과 없음" if page == 0 else "더 이상 결과가 없습니다."), None
+        lines, kb_rows = [f"🔎 '{query}' 검색 결과 ({page + 1}쪽)"], []
+        for i, row in enumerate(rows[:_SEARCH_PAGE], page * _SEARCH_PAGE + 1):
+            lines.append(f"{i}) {row.date} {row.time or ''} {row.title} {_dday_text(row.date)}")
+            kb_rows.append(kbs.list_row(row.id))
+        nav = kbs.search_nav(query, page, has_next)
+        if nav:
+            kb_rows.append(nav)
+        return "\n".join(lines), kbs.rows_markup(kb_rows)
+
+    async def search(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        query = " ".join(context.args or []).strip()
+        if not query:
+            await update.message.reply_text(
+                "사용법: /search 검색어 [YYYY-MM-DD~YYYY-MM-DD]\n예) /search 회의 2026-10-01~2026-10-31"
+            )
+            return
+        text, markup = self._render_search(update.effective_user.id, query, 0)
+        await update.message.reply_text(text, reply_markup=markup)
+
     # ====== 알림: 자연어/프리셋 ======
     async def remind(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not context.args:
-            kb = InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton(
-                            "매일 09:00 오늘 일정", callback_data="rem:daily:09:00:오늘 일정"
-                        )
-                    ],
-                    [
-                        InlineKeyboardButton(
-                            "매주 월 08:30 이번주 요약",
-                            callback_data="remw:0:08:30:이번주 일정",
-                        )
-                    ],
-                ]
-            )
             await update.message.reply_text(
                 "자연어로도 등록 가능: 예) /remind 매주 금요일 09:00 오늘 일정",
-                reply_markup=kb,
+                reply_markup=kbs.REMIND_PRESETS,
             )
             return
 
@@ -220,196 +450,192 @@ class Handlers:
 
     # ====== 알림 목록/관리 ======
     async def reminders(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        rows = self.repo.list_reminders_detailed(update.effective_user.id)
-        if not rows:
-            await update.message.reply_text("등록된 알림이 없습니다.")
+        await self._reply_view(update.message, update.effective_user.id, "reminders")
+
+    # ====== 관리자: 비싼 SQL 상위 N개 (/sqlstats [N] [reset]) ======
+    async def sqlstats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if update.effective_user.id not in self.admin_ids:
+            return  # 일반 사용자에게는 명령 존재 자체를 드러내지 않음
+        if self.profiler is None:
+            await update.message.reply_text("SQL 프로파일링이 꺼져 있습니다. (SQL_PROFILE=1)")
             return
-
-        # 묶어서 보여주되, 각 알림별 관리 버튼 제공
-        lines = []
-        kb_rows = []
-        for rid, sid, off, title, desc, dt, tm in rows[:12]:
-            dday = _dday_text(dt)
-            label = _offset_label(off)
-            time_part = tm or "시간 미정"
-            lines.append(f"• {dt} {time_part} {title} {dday}  —  [{label}]")
-            kb_rows.append(
-                [
-                    InlineKeyboardButton("🗑 알림삭제", callback_data=f"rdel:{rid}"),
-                    InlineKeyboardButton("ℹ️ 일정보기", callback_data=f"view:{sid}"),
-                    # InlineKeyboardButton("🗑 일정 알림 전체삭제", callback_data=f"rdelall:{sid}"),
-                ]
+        args = list(context.args or [])
+        if "reset" in args:
+            self.profiler.reset()
+            await update.message.reply_text("SQL 통계를 초기화했습니다.")
+            return
+        n = int(args[0]) if args and args[0].isdigit() else 10
+        since = datetime.datetime.fromtimestamp(self.profiler.started_at).strftime("%m-%d %H:%M")
+        lines = [f"🐢 누적 시간 상위 {n}개 SQL ({since} 이후)"]
+        for i, (sql, count, total, worst) in enumerate(self.profiler.top(n), 1):
+            avg = total / count if count else 0.0
+            lines.append(
+                f"{i}) 합계 {total * 1e3:.0f}ms · {count}회 · 평균 {avg * 1e3:.2f}ms · 최대 {worst * 1e3:.1f}ms\n"
+                f"   {sql[:160]}"
             )
+        if len(lines) == 1:
+            lines.append("기록된 쿼리가 없습니다.")
+        await update.message.reply_text("\n".join(lines)[:4000])
+
+    # ====== 콜백 처리 (액션 코드 → 핸들러 dict 라우팅) ======
+    def _register_callbacks(self):
+        r = self.router
+        r.register(cb.RMENU, self._cb_rmenu)
+        r.register(cb.RSET, self._cb_rset)
+        r.register(cb.REMINDERS, self._cb_reminders)
+        r.register(cb.RDEL, self._cb_rdel)
+        r.register(cb.RDELALL, self._cb_rdelall)
+        r.register(cb.DEL, self._cb_del)
+        r.register(cb.VIEW, self._cb_view)
+        r.register(cb.SUGGEST_ADD, self._cb_suggest_add)
+        r.register(cb.SEARCH, self._cb_search)
+        r.register(cb.WEEK, self._cb_week)
+        r.register(cb.MONTH, self._cb_month)
+        r.register(cb.DAY, self._cb_day)
+        r.register(cb.ADD_HINT, self._cb_add_hint)
+        r.register(cb.LIST, self._cb_list)
+        r.register(cb.TODAY, self._cb_today)
+        r.register(cb.REMIND_PRESETS, self._cb_remind_presets)
+        r.register(cb.REM_DAILY, self._cb_rem_daily)
+        r.register(cb.REM_WEEKLY, self._cb_rem_weekly)
+        r.register(cb.CONFIRM_DELETE_ALL, self._cb_confirm_delete_all)
+        r.register(cb.DO_DELETE_ALL, self._cb_do_delete_all)
+        r.register(cb.MENU, self._cb_menu)
 
-        # 마지막 줄에 새로고침/닫기
-        kb_rows.append(
-            [
-                InlineKeyboardButton("🔄 새로고침", callback_data="rlist"),
-                InlineKeyboardButton("닫기", callback_data="go:menu"),
-            ]
-        )
-
-        await update.message.reply_text("\n".join(lines), reply_markup=InlineKeyboardMarkup(kb_rows))
-
-    # ====== 콜백 처리 ======
     async def on_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         q = update.callback_query
-        await q.answer()
-        data = q.data or ""
-
-        # 알림 설정 메뉴
-        if data.startswith("rmenu:"):
-            sid = int(data.split(":")[1])
-            kb = InlineKeyboardMarkup(
-                [
-                    [InlineKeyboardButton("⏰ 일정 시간", callback_data=f"rset:{sid}:0")],
-                    [
-                        InlineKeyboardButton("🕧 30분 전", callback_data=f"rset:{sid}:30"),
-                        InlineKeyboardButton("🕐 1시간 전", callback_data=f"rset:{sid}:60"),
-                    ],
-                    [InlineKeyboardButton("🌙 하루 전 09:00", callback_data=f"rset:{sid}:1440")],
-                    [InlineKeyboardButton("❌ 닫기", callback_data="go:menu")],
-                ]
-            )
-            await q.edit_message_text("알림 시점을 선택하세요:", reply_markup=kb)
-            return
-
-        # 알림 설정 적용
-        if data.startswith("rset:"):
-            _, sid, off = data.split(":")
-            sid = int(sid)
-            offset = int(off)
-            row = self.repo.get(q.from_user.id, sid)
-            if not row:
-                await q.edit_message_text("해당 일정을 찾을 수 없습니다.")
-                return
-            await self.reminder.schedule_for_schedule(q.from_user.id, row, offset)
-            await q.edit_message_text(f"알림 설정 완료: {_offset_label(offset)}")
-            return
-
-        # 알림 목록 새로고침
-        if data == "rlist":
-            fake_update = Update(update.update_id, message=update.effective_message)
-            await self.reminders(fake_update, context)
+        try:
+            action, handler, args = self.router.resolve(q.data or "")
+        except (ValueError, KeyError, IndexError):
+            await q.answer()
+            await q.edit_message_text("만료되었거나 알 수 없는 버튼입니다. /menu 를 눌러주세요.")
             return
-
-        # 알림 단건 삭제
-        if data.startswith("rdel:"):
-            rid = int(data.split(":")[1])
-            ok = self.repo.delete_reminder(q.from_user.id, rid)
-            await q.edit_message_text("알림 삭제 완료" if ok else "알림 삭제 실패/권한 없음")
-            return
-
-        # 특정 일정의 모든 알림 삭제
-        if data.startswith("rdelall:"):
-            sid = int(data.split(":")[1])
-            self.repo.delete_reminders_for_schedule(q.from_user.id, sid)
-            await q.edit_message_text("해당 일정의 알림을 모두 삭제했습니다.")
+        if self.admission is not None and not await self.admission.admit(
+            q.from_user.id, _CALLBACK_CLASS.get(action, WRITE)
+        ):
+            await reject(update)
             return
+        await q.answer()
+        await handler(q, context, *args)
 
-        # 일정 삭제
-        if data.startswith("del:"):
-            sid = int(data.split(":")[1])
-            try:
-                self.repo.delete_reminders_for_schedule(q.from_user.id, sid)
-            except Exception:
-                pass
-            ok = self.repo.delete(q.from_user.id, sid)
-            await q.edit_message_text("삭제 완료" if ok else "삭제 실패/권한 없음")
-            return
+    # 알림 설정 메뉴
+    async def _cb_rmenu(self, q, context, sid: int):
+        await q.edit_message_text("알림 시점을 선택하세요:", reply_markup=kbs.reminder_menu(sid))
 
-        # 상세 보기
-        if data.startswith("view:"):
-            sid = int(data.split(":")[1])
-            row = self.repo.get(q.from_user.id, sid)
-            if not row:
-                await q.edit_message_text("해당 일정을 찾을 수 없습니다.")
-                return
-            _, title, desc, dt, tm = row
-            dday = _dday_text(dt)
-            kb = InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton("🔔 알림", callback_data=f"rmenu:{sid}"),
-                        InlineKeyboardButton("🗑 삭제", callback_data=f"del:{sid}"),
-                    ]
-                ]
-            )
-            await q.edit_message_text(
-                f"📅 {dt} {tm or ''}\n📝 {title}\n{desc or ''}\n{dday}", reply_markup=kb
-            )
+    # 알림 설정 적용
+    async def _cb_rset(self, q, context, sid: int, offset: int):
+        row = self.repo.get(q.from_user.id, sid)
+        if not row:
+            await q.edit_message_text("해당 일정을 찾을 수 없습니다.")
             return
+        await self.reminder.schedule_for_schedule(q.from_user.id, row, offset)
+        await q.edit_message_text(f"알림 설정 완료: {_offset_label(offset)}")
 
-        # 메뉴 라우팅
-        if data == "go:add":
-            await q.edit_message_text("일정을 자연어로 입력해주세요.\n예) 다음주 월 10시 고객 미팅")
-            return
+    # 알림 목록 (새로고침)
+    async def _cb_reminders(self, q, context):
+        await self._reply_view(q.message, q.from_user.id, "reminders")
 
-        if data == "go:list":
-            fake_update = Update(update.update_id, message=update.effective_message)
-            await self.list_all(fake_update, context)
-            return
+    # 알림 단건 삭제
+    async def _cb_rdel(self, q, context, rid: int):
+        ok = self.reminder.delete_reminder(q.from_user.id, rid)
+        await q.edit_message_text("알림 삭제 완료" if ok else "알림 삭제 실패/권한 없음")
 
-        if data == "go:today":
-            fake_update = Update(update.update_id, message=update.effective_message)
-            await self.today(fake_update, context)
-            return
+    # 특정 일정의 모든 알림 삭제
+    async def _cb_rdelall(self, q, context, sid: int):
+        self.reminder.delete_for_schedule(q.from_user.id, sid)
+        await q.edit_message_text("해당 일정의 알림을 모두 삭제했습니다.")
 
-        if data == "go:remind":
-            kb = InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton(
-                            "매일 09:00 오늘 일정", callback_data="rem:daily:09:00:오늘 일정"
-                        )
-                    ],
-                    [
-                        InlineKeyboardButton(
-                            "매주 월 08:30 이번주 요약",
-                            callback_data="remw:0:08:30:이번주 일정",
-                        )
-                    ],
-                    [InlineKeyboardButton("⏰ 알림 목록 보기", callback_data="rlist")],
-                ]
-            )
-            await q.edit_message_text("알림 프리셋:", reply_markup=kb)
+    # 일정 삭제
+    async def _cb_del(self, q, context, sid: int):
+        try:
+            self.reminder.delete_for_schedule(q.from_user.id, sid)
+        except Exception:
+            pass
+        ok = self.repo.delete(q.from_user.id, sid)
+        await q.edit_message_text("삭제 완료" if ok else "삭제 실패/권한 없음")
+
+    # 상세 보기
+    async def _cb_view(self, q, context, sid: int):
+        row = self.repo.get(q.from_user.id, sid)
+        if not row:
+            await q.edit_message_text("해당 일정을 찾을 수 없습니다.")
             return
+        dday = _dday_text(row.date)
+        await q.edit_message_text(
+            f"📅 {row.date} {row.time or ''}\n📝 {row.title}\n{row.description or ''}\n{dday}",
+            reply_markup=kbs.schedule_actions(sid),
+        )
 
-        # 자연어 알림 프리셋
-        if data.startswith("rem:"):
-            _, mode, hm, msg = data.split(":", 3)
-            hh, mm = map(int, hm.split(":"))
-            await self.reminder.schedule_custom(
-                q.from_user.id, f"매일 {hh:02d}:{mm:02d} {msg}"
-            )
-            await q.edit_message_text("알림 등록 완료")
+    # 제안 등록
+    async def _cb_suggest_add(self, q, context, msg_id: int, idx: int):
+        suggestions = self.cache.get(q.message.chat_id, msg_id) if self.cache else None
+        if not suggestions or idx >= len(suggestions):
+            await q.edit_message_text("제안이 만료되었습니다. /suggest 를 다시 실행하세요.")
             return
+        sg = suggestions[idx]
+        sid = self.repo.add(
+            q.from_user.id, sg.title, sg.description, sg.suggested_date, sg.suggested_time
+        )
+        await q.edit_message_text(
+            f"등록 완료: {sg.suggested_date} {sg.suggested_time} {sg.title} "
+            f"{_dday_text(sg.suggested_date)}",
+            reply_markup=kbs.added_actions(sid, undo=False),
+        )
 
-        if data.startswith("remw:"):
-            _, wd, hh, mm, msg = data.split(":", 4)
-            wd = int(wd)
-            await self.reminder.schedule_custom(
-                q.from_user.id, f"매주 {'월화수목금토일'[wd]} {hh}:{mm} {msg}"
-            )
-            await q.edit_message_text("알림 등록 완료")
-            return
+    # 검색 결과 페이지 이동
+    async def _cb_search(self, q, context, page: int, query: str):
+        text, markup = self._render_search(q.from_user.id, query, max(0, page))
+        await q.edit_message_text(text, reply_markup=markup)
+
+    # 기간 보기 이동 / 날짜 상세 (같은 메시지를 수정)
+    async def _cb_week(self, q, context, key: int):
+        text, markup = self._range_view(q.from_user.id, "week", key)
+        await q.edit_message_text(text, reply_markup=markup)
+
+    async def _cb_month(self, q, context, key: int):
+        text, markup = self._range_view(q.from_user.id, "month", key)
+        await q.edit_message_text(text, reply_markup=markup)
+
+    async def _cb_day(self, q, context, key: int):
+        text, markup = self._range_view(q.from_user.id, "day", key)
+        await q.edit_message_text(text, reply_markup=markup)
+
+    # 메뉴 라우팅
+    async def _cb_add_hint(self, q, context):
+        await q.edit_message_text("일정을 자연어로 입력해주세요.\n예) 다음주 월 10시 고객 미팅")
+
+    async def _cb_list(self, q, context):
+        await self._reply_view(q.message, q.from_user.id, "list")
+
+    async def _cb_today(self, q, context):
+        await self._reply_view(q.message, q.from_user.id, "today")
+
+    async def _cb_remind_presets(self, q, context):
+        await q.edit_message_text("알림 프리셋:", reply_markup=kbs.REMIND_PRESETS_WITH_LIST)
+
+    # 자연어 알림 프리셋 (msg: 프리셋 인덱스 또는 예전 버튼의 문구)
+    async def _cb_rem_daily(self, q, context, hh: int, mm: int, msg):
+        if isinstance(msg, int):
+            msg = cb.PRESET_TEXTS[msg]
+        await self.reminder.schedule_custom(q.from_user.id, f"매일 {hh:02d}:{mm:02d} {msg}")
+        await q.edit_message_text("알림 등록 완료")
+
+    async def _cb_rem_weekly(self, q, context, wd: int, hh: int, mm: int, msg):
+        if isinstance(msg, int):
+            msg = cb.PRESET_TEXTS[msg]
+        await self.reminder.schedule_custom(
+            q.from_user.id, f"매주 {'월화수목금토일'[wd]} {hh:02d}:{mm:02d} {msg}"
+        )
+        await q.edit_message_text("알림 등록 완료")
 
-        # 전체 삭제 확인 & 실행
-        if data == "confirm:delete_all":
-            kb = InlineKeyboardMarkup(
-                [
-                    [InlineKeyboardButton("✅ 예, 모두 삭제", callback_data="do:delete_all")],
-                    [InlineKeyboardButton("❌ 취소", callback_data="go:menu")],
-                ]
-            )
-            await q.edit_message_text("정말 모든 일정을 삭제할까요?", reply_markup=kb)
-            return
+    # 전체 삭제 확인 & 실행
+    async def _cb_confirm_delete_all(self, q, context):
+        await q.edit_message_text("정말 모든 일정을 삭제할까요?", reply_markup=kbs.CONFIRM_DELETE_ALL)
 
-        if data == "do:delete_all":
-            cnt = self.repo.delete_all(q.from_user.id)
-            await q.edit_message_text(f"전체 삭제 완료 ({cnt}건)")
-            return
+    async def _cb_do_delete_all(self, q, context):
+        self.reminder.forget_user(q.from_user.id)
+        cnt = self.repo.delete_all(q.from_user.id)
+        await q.edit_message_text(f"전체 삭제 완료 ({cnt}건)")
 
-        if data == "go:menu":
-            await self.menu(update, context)
-            return
+    async def _cb_menu(self, q, context):
+        await q.message.reply_text("메뉴를 선택하세요:", reply_markup=kbs.MAIN_MENU)
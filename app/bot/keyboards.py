@@ -1,10 +1,167 @@
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from functools import lru_cache
+
+from app.bot import callbacks as cb
+
+from telegram import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    KeyboardButton,
+    ReplyKeyboardMarkup,
+)
+
+# ====== 정적 키보드 (모듈 로드 시 한 번 생성, 텔레그램 객체는 불변이라 공유 가능) ======
+
+REPLY_MENU = ReplyKeyboardMarkup(
+    [
+        [KeyboardButton("/add"), KeyboardButton("/list")],
+        [KeyboardButton("/today"), KeyboardButton("/remind")],
+        [KeyboardButton("/reminders"), KeyboardButton("/delete_all")],
+        [KeyboardButton("/menu")],
+    ],
+    resize_keyboard=True,
+)
+
+MAIN_MENU = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("➕ 일정 추가", callback_data=cb.encode(cb.ADD_HINT))],
+        [
+            InlineKeyboardButton("📋 전체 일정", callback_data=cb.encode(cb.LIST)),
+            InlineKeyboardButton("📅 오늘 일정", callback_data=cb.encode(cb.TODAY)),
+        ],
+        [
+            InlineKeyboardButton("🔔 알림 프리셋", callback_data=cb.encode(cb.REMIND_PRESETS)),
+            InlineKeyboardButton("⏰ 알림 목록", callback_data=cb.encode(cb.REMINDERS)),
+        ],
+        [
+            InlineKeyboardButton("🗓 이번 주", callback_data=cb.encode(cb.WEEK, 0)),
+            InlineKeyboardButton("🗓 이번 달", callback_data=cb.encode(cb.MONTH, 0)),
+        ],
+        [InlineKeyboardButton("🧹 전체 삭제", callback_data=cb.encode(cb.CONFIRM_DELETE_ALL))],
+    ]
+)
+
+_PRESET_ROWS = (
+    (InlineKeyboardButton("매일 09:00 오늘 일정", callback_data=cb.encode(cb.REM_DAILY, 9, 0, 0)),),
+    (InlineKeyboardButton("매주 월 08:30 이번주 요약", callback_data=cb.encode(cb.REM_WEEKLY, 0, 8, 30, 1)),),
+)
+
+REMIND_PRESETS = InlineKeyboardMarkup(_PRESET_ROWS)
+
+REMIND_PRESETS_WITH_LIST = InlineKeyboardMarkup(
+    _PRESET_ROWS + ((InlineKeyboardButton("⏰ 알림 목록 보기", callback_data=cb.encode(cb.REMINDERS)),),)
+)
+
+CONFIRM_DELETE_ALL = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("✅ 예, 모두 삭제", callback_data=cb.encode(cb.DO_DELETE_ALL))],
+        [InlineKeyboardButton("❌ 취소", callback_data=cb.encode(cb.MENU))],
+    ]
+)
+
+REMINDER_LIST_FOOTER = (
+    InlineKeyboardButton("🔄 새로고침", callback_data=cb.encode(cb.REMINDERS)),
+    InlineKeyboardButton("닫기", callback_data=cb.encode(cb.MENU)),
+)
+
+
+# ====== 일정 id 별 템플릿 (id 단위 캐시) ======
+
+@lru_cache(maxsize=4096)
+def reminder_menu(sid: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        [
+            [InlineKeyboardButton("⏰ 일정 시간", callback_data=cb.encode(cb.RSET, sid, 0))],
+            [
+                InlineKeyboardButton("🕧 30분 전", callback_data=cb.encode(cb.RSET, sid, 30)),
+                InlineKeyboardButton("🕐 1시간 전", callback_data=cb.encode(cb.RSET, sid, 60)),
+            ],
+            [InlineKeyboardButton("🌙 하루 전 09:00", callback_data=cb.encode(cb.RSET, sid, 1440))],
+            [InlineKeyboardButton("❌ 닫기", callback_data=cb.encode(cb.MENU))],
+        ]
+    )
+
+
+@lru_cache(maxsize=8192)
+def list_row(sid: int):
+    return (
+        InlineKeyboardButton("🔔 알림", callback_data=cb.encode(cb.RMENU, sid)),
+        InlineKeyboardButton("ℹ️ 상세", callback_data=cb.encode(cb.VIEW, sid)),
+        InlineKeyboardButton("🗑 삭제", callback_data=cb.encode(cb.DEL, sid)),
+    )
+
+
+@lru_cache(maxsize=8192)
+def today_row(sid: int):
+    return (
+        InlineKeyboardButton("🔔 알림", callback_data=cb.encode(cb.RMENU, sid)),
+        InlineKeyboardButton("🗑 삭제", callback_data=cb.encode(cb.DEL, sid)),
+    )
+
+
+@lru_cache(maxsize=8192)
+def reminder_row(rid: int, sid: int):
+    return (
+        InlineKeyboardButton("🗑 알림삭제", callback_data=cb.encode(cb.RDEL, rid)),
+        InlineKeyboardButton("ℹ️ 일정보기", callback_data=cb.encode(cb.VIEW, sid)),
+    )
+
+
+@lru_cache(maxsize=4096)
+def added_actions(sid: int, undo: bool) -> InlineKeyboardMarkup:
+    row = [InlineKeyboardButton("🔔 알림 설정", callback_data=cb.encode(cb.RMENU, sid))]
+    if undo:
+        row.append(InlineKeyboardButton("🗑 되돌리기", callback_data=cb.encode(cb.DEL, sid)))
+    return InlineKeyboardMarkup([row])
+
+
+@lru_cache(maxsize=4096)
+def schedule_actions(sid: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([today_row(sid)])
+
+
+# ====== 기간 보기 (/week, /month) ======
+# 키: 주 = 월요일 YYYYMMDD, 달 = YYYYMM, 날짜 = YYYYMMDD (정수라 callback_data 가 짧음)
+
+@lru_cache(maxsize=4096)
+def day_button(ymd: int, label: str) -> InlineKeyboardButton:
+    return InlineKeyboardButton(label, callback_data=cb.encode(cb.DAY, ymd))
+
+
+@lru_cache(maxsize=1024)
+def range_nav(action: str, prev_key: int, next_key: int, prev_label: str, next_label: str):
+    return (
+        InlineKeyboardButton(f"◀ {prev_label}", callback_data=cb.encode(action, prev_key)),
+        InlineKeyboardButton(f"{next_label} ▶", callback_data=cb.encode(action, next_key)),
+    )
+
+
+@lru_cache(maxsize=1024)
+def back_to_week(monday_key: int):
+    return (InlineKeyboardButton("◀ 주간 보기", callback_data=cb.encode(cb.WEEK, monday_key)),)
+
+
+def search_nav(query: str, page: int, has_next: bool):
+    """검색 결과 이전/다음 버튼. 검색어가 길어 callback_data 64바이트를 넘으면 버튼 없음"""
+    row = []
+    try:
+        if page > 0:
+            row.append(InlineKeyboardButton("◀ 이전", callback_data=cb.encode(cb.SEARCH, page - 1, query)))
+        if has_next:
+            row.append(InlineKeyboardButton("다음 ▶", callback_data=cb.encode(cb.SEARCH, page + 1, query)))
+    except ValueError:
+        return ()
+    return tuple(row)
+
+
+def rows_markup(rows) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(tuple(rows))
+
 
 def suggestion_keyboard(msg_id: int, n: int):
     rows = []
     for i in range(n):
         rows.append([InlineKeyboardButton(
             text=f"제안 {i+1} 등록",
-            callback_data=f"suggest_add:{msg_id}:{i}"
+            callback_data=cb.encode(cb.SUGGEST_ADD, msg_id, i)
         )])
     return InlineKeyboardMarkup(rows)
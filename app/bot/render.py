@@ -0,0 +1,37 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class ViewCache:
+    """
+    렌더링된 목록 화면(text, markup) LRU 캐시
+
+    키: (user_id, view, page, data_version, today)
+      - data_version: ScheduleRepo.version(user_id) — 해당 사용자 데이터가 바뀌면 증가
+      - today: D-day 표기가 날짜에 따라 바뀌므로 포함
+    같은 화면을 다시 열면 DB 조회와 키보드 객체 생성을 모두 건너뜀
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._store: "OrderedDict[Hashable, Tuple[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: Hashable) -> Optional[Tuple[str, Any]]:
+        v = self._store.get(key)
+        if v is None:
+            self.misses += 1
+            return None
+        self._store.move_to_end(key)
+        self.hits += 1
+        return v
+
+    def put(self, key: Hashable, text: str, markup: Any):
+        self._store[key] = (text, markup)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
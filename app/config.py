@@ -5,9 +5,79 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parents[1]
 load_dotenv(BASE_DIR / ".env")
 
+def _floats(name: str, default: str):
+    return tuple(float(x) for x in os.getenv(name, default).split(","))
+
+def _ints(name: str, default: str = ""):
+    return tuple(int(x) for x in os.getenv(name, default).split(",") if x.strip())
+
 class Settings:
     BOT_TOKEN = os.getenv("BOT_TOKEN", "")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     DATABASE_PATH = os.getenv("DATABASE_PATH", str(BASE_DIR / "data/schedules.db"))
+    # Bot API 주소 (부하 테스트용 가짜 서버 등, 비우면 api.telegram.org)
+    BOT_API_BASE_URL = os.getenv("BOT_API_BASE_URL", "")
+
+    # 발송 속도 제한 (텔레그램: 전역 ~30 msg/s, 채팅당 ~1 msg/s)
+    SEND_GLOBAL_RATE = float(os.getenv("SEND_GLOBAL_RATE", "25"))
+    SEND_CHAT_RATE = float(os.getenv("SEND_CHAT_RATE", "1"))
+    SEND_CHAT_BURST = float(os.getenv("SEND_CHAT_BURST", "3"))
+
+    # 다중 워커 알림 샤딩 (WORKER_ID 미지정 시 host:pid:random)
+    WORKER_ID = os.getenv("WORKER_ID", "")
+    REMINDER_SHARDS = int(os.getenv("REMINDER_SHARDS", "16"))
+    LEASE_TTL_SEC = float(os.getenv("LEASE_TTL_SEC", "30"))
+
+    # 재시작 후 놓친 알림 보충 발송 (유예 시간/최대 건수)
+    CATCHUP_GRACE_MIN = int(os.getenv("CATCHUP_GRACE_MIN", "60"))
+    CATCHUP_MAX = int(os.getenv("CATCHUP_MAX", "500"))
+
+    # 동시에 처리할 업데이트 수 (같은 사용자는 순서대로)
+    CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", "32"))
+
+    # 자유 입력 디바운스: 이 시간(초) 안에 이어 보낸 메시지는 합쳐서 한 번만 파싱
+    TEXT_DEBOUNCE_SEC = float(os.getenv("TEXT_DEBOUNCE_SEC", "1.5"))
+
+    # /suggest 결과 캐시: memory(프로세스 내) | sqlite(여러 프로세스 공유)
+    SUGGESTION_CACHE_BACKEND = os.getenv("SUGGESTION_CACHE_BACKEND", "memory")
+    SUGGESTION_CACHE_MAX = int(os.getenv("SUGGESTION_CACHE_MAX", "4096"))
+    SUGGESTION_CACHE_TTL_SEC = int(os.getenv("SUGGESTION_CACHE_TTL_SEC", "600"))
+
+    # 명령 유입 제한: "사용자 초당,사용자 버스트,전체 초당,전체 버스트"
+    ADMIT_LLM = _floats("ADMIT_LLM", "0.2,3,2,10")
+    ADMIT_WRITE = _floats("ADMIT_WRITE", "2,10,50,100")
+    ADMIT_READ = _floats("ADMIT_READ", "3,15,100,200")
+    ADMIT_MAX_WAIT_SEC = float(os.getenv("ADMIT_MAX_WAIT_SEC", "2"))
+
+    # Prometheus 메트릭 HTTP (GET /metrics), 0이면 끔
+    METRICS_ADDR = os.getenv("METRICS_ADDR", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+    # SQL 프로파일링(기본 끔): 문장별 횟수/시간 집계, SQL_SLOW_MS 이상이면 실행 계획과 함께 경고 로그
+    SQL_PROFILE = os.getenv("SQL_PROFILE", "0") == "1"
+    SQL_SLOW_MS = float(os.getenv("SQL_SLOW_MS", "50"))
+    # 관리자 명령(/sqlstats) 허용 사용자 id (쉼표 구분)
+    ADMIN_IDS = _ints("ADMIN_IDS")
+
+    # DB 정리: 매일 MAINTENANCE_HM(KST)에 보관 기간이 지난 일정을 schedules_archive 로 이동, 빈 페이지 반환
+    ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "90"))
+    MAINTENANCE_HM = os.getenv("MAINTENANCE_HM", "04:00")
+    MAINTENANCE_BATCH = int(os.getenv("MAINTENANCE_BATCH", "500"))
+
+    # 온라인 백업: BACKUP_INTERVAL_MIN 마다 BACKUP_DIR 에 gzip 스냅샷 (0이면 끔), 최근 BACKUP_KEEP 개 유지 (1 이상)
+    BACKUP_DIR = os.getenv("BACKUP_DIR", str(BASE_DIR / "data/backups"))
+    BACKUP_INTERVAL_MIN = float(os.getenv("BACKUP_INTERVAL_MIN", "360"))
+    BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+    BACKUP_PAGES = int(os.getenv("BACKUP_PAGES", "256"))
+    # 기동 시 복원할 스냅샷 경로 또는 latest (비우면 복원 안 함)
+    BACKUP_RESTORE = os.getenv("BACKUP_RESTORE", "")
+
+    # 업데이트 수신 방식: polling | webhook
+    BOT_MODE = os.getenv("BOT_MODE", "polling")
+    WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+    WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+    WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram")
+    WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+    WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # 외부 공개 URL (예: https://bot.example.com/telegram)
 
 settings = Settings()
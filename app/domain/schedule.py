@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Literal
 
+from app.services.timeutil import parse_hm, parse_ymd
+
 Priority = Literal["high", "medium", "low"]
 
 class Schedule(BaseModel):
@@ -16,15 +18,13 @@ class Schedule(BaseModel):
     @field_validator("date")
     @classmethod
     def _date_fmt(cls, v:str)->str:
-        import datetime
-        datetime.datetime.strptime(v, "%Y-%m-%d")
+        parse_ymd(v)
         return v
 
     @field_validator("time")
     @classmethod
     def _time_fmt(cls, v:Optional[str])->Optional[str]:
-        import datetime
         if v is None:
             return v
-        datetime.datetime.strptime(v, "%H:%M")
+        parse_hm(v)
         return v
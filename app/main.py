@@ -4,46 +4,184 @@ from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, Cal
 
 from app.config import settings
 from app.storage.db import DB
+from app.storage.profiler import QueryProfiler
 from app.storage.schedule_repo import ScheduleRepo
+from app.storage.lease_repo import LeaseRepo
 from app.services.kdate_parser import KDateParser
 from app.services.ai_client import AIClient
 from app.services.ai_schedule_parser import AIScheduleParser
 from app.services.reminder import ReminderService
+from app.services.digest import DigestService
+from app.services.maintenance import MaintenanceService
+from app.services.backup import BackupService, restore_snapshot
+from app.services.sharding import ShardCoordinator
+from app.services.suggester import SuggestionService
+from app.services.cache import SuggestionCache, dump_suggestions, load_suggestions
+from app.storage.cache_repo import SQLiteCacheBackend
 from app.bot.handlers import Handlers
+from app.bot.admission import AdmissionController, LLM, READ, WRITE
 from app.bot.builder import PTBSender
+from app.services.outbox import Outbox
+from app.services import metrics
+from app.services.metrics import ADMISSION, SIZE, track_handler
 
 def setup_logging():
     logging.basicConfig(format="%(asctime)s %(levelname)s [%(name)s] %(message)s", level=logging.INFO)
 
-def main():
-    setup_logging()
-    app = ApplicationBuilder().token(settings.BOT_TOKEN).build()
+def build_application():
+    builder = (
+        ApplicationBuilder()
+        .token(settings.BOT_TOKEN)
+        .concurrent_updates(settings.CONCURRENT_UPDATES)
+    )
+    if settings.BOT_API_BASE_URL:
+        builder = builder.base_url(settings.BOT_API_BASE_URL)
+    app = builder.build()
 
-    db = DB(settings.DATABASE_PATH)
+    if settings.BACKUP_RESTORE:
+        restore_snapshot(settings.BACKUP_RESTORE, settings.DATABASE_PATH, settings.BACKUP_DIR)
+    profiler = QueryProfiler(settings.SQL_SLOW_MS) if settings.SQL_PROFILE else None
+    db = DB(settings.DATABASE_PATH, profiler=profiler)
     repo = ScheduleRepo(db)
     kparser = KDateParser()
     ai_client = AIClient(settings.OPENAI_API_KEY)
     ai = AIScheduleParser(ai_client, kparser)
 
-    sender = PTBSender(app)
-    reminder = ReminderService(repo, sender)
+    outbox = Outbox(
+        app,
+        global_rate=settings.SEND_GLOBAL_RATE,
+        chat_rate=settings.SEND_CHAT_RATE,
+        chat_burst=settings.SEND_CHAT_BURST,
+    )
+    outbox.setup(app)
+    sender = PTBSender(app, outbox)
+    shards = ShardCoordinator(
+        LeaseRepo(db),
+        worker_id=settings.WORKER_ID,
+        shard_count=settings.REMINDER_SHARDS,
+        ttl_sec=settings.LEASE_TTL_SEC,
+    )
+    digest = DigestService(repo, sender, shards=shards)
+    digest.setup(app)
+    reminder = ReminderService(
+        repo, sender, digest=digest, shards=shards,
+        catchup_grace_sec=settings.CATCHUP_GRACE_MIN * 60,
+        catchup_max=settings.CATCHUP_MAX,
+    )
     reminder.setup(app)
+    MaintenanceService(
+        repo, shards=shards,
+        retention_days=settings.ARCHIVE_RETENTION_DAYS,
+        batch_size=settings.MAINTENANCE_BATCH,
+        hm=settings.MAINTENANCE_HM,
+    ).setup(app)
+    if settings.BACKUP_INTERVAL_MIN > 0:
+        BackupService(
+            db, settings.BACKUP_DIR,
+            interval_sec=settings.BACKUP_INTERVAL_MIN * 60,
+            keep=settings.BACKUP_KEEP,
+            pages=settings.BACKUP_PAGES,
+            shards=shards,
+        ).setup(app)
+
+    suggester = SuggestionService(repo)
+    cache_backend = None
+    if settings.SUGGESTION_CACHE_BACKEND == "sqlite":
+        cache_backend = SQLiteCacheBackend(
+            db, max_entries=settings.SUGGESTION_CACHE_MAX,
+            dumps=dump_suggestions, loads=load_suggestions,
+        )
+    cache = SuggestionCache(
+        ttl_sec=settings.SUGGESTION_CACHE_TTL_SEC,
+        max_entries=settings.SUGGESTION_CACHE_MAX,
+        backend=cache_backend,
+    )
+    cache.setup(app)
+
+    admission = AdmissionController(
+        {LLM: settings.ADMIT_LLM, WRITE: settings.ADMIT_WRITE, READ: settings.ADMIT_READ},
+        max_wait_sec=settings.ADMIT_MAX_WAIT_SEC,
+    )
+
+    handlers = Handlers(
+        repo=repo, ai=ai, kparser=kparser, reminder=reminder,
+        suggester=suggester, cache=cache,
+        text_debounce_sec=settings.TEXT_DEBOUNCE_SEC,
+        admission=admission,
+        profiler=profiler,
+        admin_ids=settings.ADMIN_IDS,
+    )
+
+    register_gauges(app, reminder, outbox, cache, handlers, admission)
+
+    # 동시 처리 시 같은 사용자의 업데이트는 순서대로 (Handlers.serialized)
+    # 그 안에서 명령 분류별 유입 제한 (AdmissionController.guard, 콜백은 on_callback 안에서 액션별로)
+    # 가장 바깥에서 처리 시간 계측 (락/유입 제한 대기 포함)
+    h = handlers.serialized
+    g = admission.guard
 
-    handlers = Handlers(repo=repo, ai=ai, kparser=kparser, reminder=reminder)
-
-    app.add_handler(CommandHandler("start", handlers.start))
-    app.add_handler(CommandHandler("menu", handlers.menu))
-    app.add_handler(CommandHandler("add", handlers.add))
-    app.add_handler(CommandHandler("list", handlers.list_all))
-    app.add_handler(CommandHandler("today", handlers.today))
-    app.add_handler(CommandHandler("delete", handlers.delete))
-    app.add_handler(CommandHandler("delete_all", handlers.delete_all))
-    app.add_handler(CommandHandler("remind", handlers.remind))
-    app.add_handler(CallbackQueryHandler(handlers.on_callback))
-    app.add_handler(CommandHandler("reminders", handlers.reminders))
-
-    print("🤖 AI 기반 일정 관리 봇 시작")
-    app.run_polling(allowed_updates=[])
+    def command(name, klass, fn):
+        app.add_handler(CommandHandler(name, track_handler(name, h(g(klass, fn)))))
+
+    command("start", READ, handlers.start)
+    command("menu", READ, handlers.menu)
+    # /add 는 LLM 을 쓸 수 있을 때만 LLM 분류, 아니면 로컬 파서 + 저장이므로 WRITE
+    command("add", lambda: LLM if ai.available() else WRITE, handlers.add)
+    command("list", READ, handlers.list_all)
+    command("today", READ, handlers.today)
+    command("week", READ, handlers.week)
+    command("month", READ, handlers.month)
+    command("delete", WRITE, handlers.delete)
+    command("delete_all", WRITE, handlers.delete_all)
+    command("remind", WRITE, handlers.remind)
+    command("suggest", READ, handlers.suggest)
+    command("search", READ, handlers.search)
+    app.add_handler(CallbackQueryHandler(track_handler("callback", h(handlers.on_callback))))
+    command("reminders", READ, handlers.reminders)
+    command("sqlstats", READ, handlers.sqlstats)
+    # 명령어가 아닌 일반 문장은 일정 추가로 (연속 입력은 디바운스로 한 번에 파싱)
+    # 조각 수신은 READ, LLM 유입 제한은 합친 텍스트를 파싱하기 직전에 한 번 (Handlers._parse_free_text)
+    app.add_handler(MessageHandler(
+        filters.TEXT & ~filters.COMMAND, track_handler("text", h(g(READ, handlers.on_text)))
+    ))
+    return app
+
+def register_gauges(app, reminder, outbox, cache, handlers, admission):
+    """수집 시점에 읽는 크기/누계 게이지"""
+    SIZE.set_function(lambda: len(app.job_queue.jobs()), "job_queue")
+    SIZE.set_function(lambda: len(reminder.dispatcher), "dispatcher")
+    SIZE.set_function(lambda: len(outbox), "outbox")
+    SIZE.set_function(lambda: len(cache), "suggestion_cache")
+    SIZE.set_function(lambda: len(handlers.views), "view_cache")
+    SIZE.set_function(lambda: len(handlers.debouncer), "text_debounce")
+    for klass in (LLM, WRITE, READ):
+        for result in ("admitted", "delayed", "rejected"):
+            counts = getattr(admission, result)
+            ADMISSION.set_function(lambda c=counts, k=klass: c[k], klass, result)
+
+def run(app):
+    if settings.BOT_MODE == "webhook":
+        if not (settings.WEBHOOK_SECRET and settings.WEBHOOK_URL):
+            raise SystemExit("BOT_MODE=webhook 에는 WEBHOOK_SECRET, WEBHOOK_URL 이 필요합니다.")
+        # 내장 비동기 HTTP 서버(tornado)가 secret token 헤더를 검증한 뒤 같은 핸들러로 전달
+        app.run_webhook(
+            listen=settings.WEBHOOK_LISTEN,
+            port=settings.WEBHOOK_PORT,
+            url_path=settings.WEBHOOK_PATH,
+            secret_token=settings.WEBHOOK_SECRET,
+            webhook_url=settings.WEBHOOK_URL,
+            allowed_updates=[],
+        )
+    else:
+        app.run_polling(allowed_updates=[])
+
+def main():
+    setup_logging()
+    app = build_application()
+    if settings.METRICS_PORT:
+        metrics.serve(settings.METRICS_ADDR, settings.METRICS_PORT)
+    print(f"🤖 AI 기반 일정 관리 봇 시작 ({settings.BOT_MODE})")
+    run(app)
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,7 @@
 import json, re, datetime
 from typing import Optional
 from app.services.kdate_parser import KDateParser
+from app.services.timeutil import is_valid_hm
 
 KST = datetime.timezone(datetime.timedelta(hours=9))
 
@@ -105,13 +106,7 @@ def _is_valid_ymd(s: Optional[str]) -> bool:
     except Exception:
         return False
 
-def _is_valid_hm(s: Optional[str]) -> bool:
-    if not s: return False
-    try:
-        datetime.datetime.strptime(s, "%H:%M")
-        return True
-    except Exception:
-        return False
+_is_valid_hm = is_valid_hm
 
 _DATE_TIME_TOKENS = re.compile(
     r"(내일\s*모레|내일모레|모레|내일|오늘|이번주|다음주|오전|오후|\d{1,2}\s*시(\s*\d{1,2}\s*분)?|\d{1,2}:\d{2})"
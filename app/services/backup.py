@@ -0,0 +1,190 @@
+# app/services/backup.py
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from telegram.ext import Application, CallbackContext
+
+from app.services.metrics import BACKUP_BYTES, BACKUP_SECONDS, BACKUPS
+
+log = logging.getLogger(__name__)
+
+_PREFIX = "schedules-"
+_SUFFIX = ".db.gz"
+
+
+class _Restarted(Exception):
+    pass
+
+
+def list_snapshots(backup_dir: str) -> List[Path]:
+    """오래된 것부터 정렬된 스냅샷 목록 (파일 이름에 시각이 들어 있어 이름순 = 시간순)"""
+    d = Path(backup_dir)
+    if not d.is_dir():
+        return []
+    return sorted(p for p in d.iterdir() if p.name.startswith(_PREFIX) and p.name.endswith(_SUFFIX))
+
+
+def _quick_check(conn: sqlite3.Connection):
+    result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    if result != "ok":
+        raise sqlite3.DatabaseError(f"quick_check 실패: {result}")
+
+
+def restore_snapshot(snapshot: str, db_path: str, backup_dir: str) -> Path:
+    """
+    기동 시 스냅샷 복원 (DB 를 열기 전에 호출)
+    - snapshot: 파일 경로 또는 "latest" (backup_dir 의 가장 최근 스냅샷)
+    - 임시 파일에 압축 해제 → quick_check → backup API 로 db_path 에 덮어씀 (잠금 하에 통째로 교체)
+    """
+    if snapshot == "latest":
+        snaps = list_snapshots(backup_dir)
+        if not snaps:
+            raise FileNotFoundError(f"{backup_dir} 에 스냅샷이 없습니다.")
+        src_path = snaps[-1]
+    else:
+        src_path = Path(snapshot)
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".db", dir=str(Path(db_path).parent))
+    try:
+        with os.fdopen(fd, "wb") as out, gzip.open(src_path, "rb") as gz:
+            shutil.copyfileobj(gz, out, 1 << 20)
+        src = sqlite3.connect(tmp)
+        dst = sqlite3.connect(db_path)
+        try:
+            _quick_check(src)
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+    finally:
+        os.unlink(tmp)
+    log.warning("DB 복원: %s → %s", src_path, db_path)
+    return src_path
+
+
+class BackupService:
+    """
+    실행 중 온라인 백업 (sqlite3 backup API)
+
+    - pages 페이지씩 단계별 복사, 단계 사이 pause_sec 쉬어 쓰기 트랜잭션이 끼어들 수 있게 함
+      (작업은 스레드에서 → 이벤트 루프는 막히지 않음, 원본 잠금은 한 단계 동안만)
+    - 복사 중 다른 연결이 원본을 바꾸면 SQLite 가 처음부터 다시 복사함
+      max_restarts 번 넘게 다시 시작되면 한 번에 전체 복사 (짧게 잠금)
+    - 임시 파일 quick_check 후 gzip 으로 backup_dir/schedules-YYYYmmdd-HHMMSS-fff.db.gz (밀리초까지,
+      같은 이름이 있으면 1ms 뒤로), 최근 keep(1 이상) 개만 유지
+    - 다중 워커면 주기 슬롯마다 선점한 워커만 실행
+    """
+
+    def __init__(self, db, backup_dir: str, interval_sec: float = 6 * 3600, keep: int = 7,
+                 pages: int = 256, pause_sec: float = 0.005, max_restarts: int = 5, shards=None):
+        self.db = db
+        if keep < 1:
+            raise ValueError(f"keep 은 1 이상이어야 합니다: {keep}")
+        self.backup_dir = Path(backup_dir)
+        self.interval = interval_sec
+        self.keep = keep
+        self.pages = pages
+        self.pause_sec = pause_sec
+        self.max_restarts = max_restarts
+        self.shards = shards
+        self.last: Optional[dict] = None
+
+    def setup(self, app: Application):
+        app.job_queue.run_repeating(
+            self._run, interval=self.interval, first=self.interval, name="db:backup"
+        )
+
+    async def _run(self, context: CallbackContext):
+        slot = int(time.time() // self.interval)
+        if self.shards is not None and not self.shards.claim_once(f"backup:{slot}"):
+            return
+        try:
+            await self.run()
+        except Exception:
+            log.exception("DB 백업 실패")
+
+    async def run(self) -> dict:
+        """백업 1회 (스레드에서 실행) 후 결과 반환"""
+        t0 = time.perf_counter()
+        try:
+            info = await asyncio.to_thread(self._backup)
+        except Exception:
+            BACKUPS.inc("failed")
+            raise
+        info["elapsed_sec"] = round(time.perf_counter() - t0, 3)
+        BACKUP_SECONDS.observe(info["elapsed_sec"])
+        BACKUPS.inc("ok")
+        BACKUP_BYTES.set(info["db_bytes"], "db")
+        BACKUP_BYTES.set(info["gz_bytes"], "gz")
+        self.last = info
+        log.info("DB 백업: %s", info)
+        return info
+
+    def _copy(self, src: sqlite3.Connection, dst: sqlite3.Connection) -> int:
+        """단계별 복사 → 다시 시작된 횟수"""
+        state = {"remaining": None, "restarts": 0}
+
+        def progress(status, remaining, total):
+            prev = state["remaining"]
+            if prev is not None and remaining > prev:
+                state["restarts"] += 1
+                if state["restarts"] > self.max_restarts:
+                    raise _Restarted()
+            state["remaining"] = remaining
+            if remaining and self.pause_sec:
+                time.sleep(self.pause_sec)
+
+        try:
+            src.backup(dst, pages=self.pages, progress=progress)
+        except _Restarted:
+            src.backup(dst)  # 계속 바뀌는 중이면 한 번에
+        return state["restarts"]
+
+    def _snapshot_name(self) -> str:
+        """밀리초까지 넣은 이름, 이미 있으면 1ms 씩 밀어 이름순 = 시간순 유지"""
+        ms = int(time.time() * 1000)
+        while True:
+            stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(ms // 1000))}-{ms % 1000:03d}"
+            name = f"{_PREFIX}{stamp}{_SUFFIX}"
+            if not (self.backup_dir / name).exists():
+                return name
+            ms += 1
+
+    def _backup(self) -> dict:
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        name = self._snapshot_name()
+        tmp_db = self.backup_dir / (name + ".tmp")
+        tmp_gz = self.backup_dir / (name + ".part")
+        try:
+            src = self.db.connect()
+            dst = sqlite3.connect(tmp_db)
+            try:
+                restarts = self._copy(src, dst)
+                _quick_check(dst)
+            finally:
+                src.close()
+                dst.close()
+            with open(tmp_db, "rb") as f, gzip.open(tmp_gz, "wb", compresslevel=6) as gz:
+                shutil.copyfileobj(f, gz, 1 << 20)
+            os.replace(tmp_gz, self.backup_dir / name)
+            info = {
+                "file": name,
+                "db_bytes": tmp_db.stat().st_size,
+                "gz_bytes": (self.backup_dir / name).stat().st_size,
+                "restarts": restarts,
+            }
+        finally:
+            for p in (tmp_db, tmp_gz):
+                if p.exists():
+                    p.unlink()
+        for old in list_snapshots(str(self.backup_dir))[:-self.keep]:
+            old.unlink()
+        return info
@@ -1,19 +1,128 @@
+import json
 import time
-from typing import Dict, Any, Tuple
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, List, Optional, Tuple
+
+from telegram.ext import Application, CallbackContext
+
+if TYPE_CHECKING:
+    from app.domain.suggestion import Suggestion
+
+
+class MemoryCacheBackend:
+    """
+    프로세스 내 LRU 저장소
+
+    - OrderedDict: get 시 move_to_end, put 시 초과분을 앞에서부터 popitem → 모두 O(1)
+    - 값: (expires_at, payload)
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._store: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: Hashable, now: float) -> Tuple[Optional[Any], bool]:
+        """(payload, 만료로 삭제됐는지)"""
+        v = self._store.get(key)
+        if v is None:
+            return None, False
+        expires_at, payload = v
+        if expires_at <= now:
+            del self._store[key]
+            return None, True
+        self._store.move_to_end(key)
+        return payload, False
+
+    def put(self, key: Hashable, expires_at: float, payload: Any) -> int:
+        """저장 후 LRU로 밀려난 개수 반환"""
+        self._store[key] = (expires_at, payload)
+        self._store.move_to_end(key)
+        evicted = 0
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: Hashable):
+        self._store.pop(key, None)
+
+    def sweep(self, now: float) -> Tuple[int, int]:
+        """만료 항목 정리. (만료 삭제 수, LRU 삭제 수)"""
+        expired = [k for k, (exp, _) in self._store.items() if exp <= now]
+        for k in expired:
+            del self._store[k]
+        return len(expired), 0
+
+
+def dump_suggestions(payload: List["Suggestion"]) -> str:
+    return json.dumps([s.model_dump() for s in payload], ensure_ascii=False)
+
+
+def load_suggestions(raw: str) -> List["Suggestion"]:
+    from app.domain.suggestion import Suggestion
+    return [Suggestion(**d) for d in json.loads(raw)]
+
 
 class SuggestionCache:
-    def __init__(self, ttl_sec: int = 600):
+    """
+    /suggest 결과 캐시 ((chat_id, msg_id) → 제안 목록)
+
+    - 최대 max_entries개, 넘치면 가장 오래 안 쓴 항목부터 삭제 (LRU)
+    - TTL은 get에서도 확인하지만, 다시 읽히지 않는 항목은 job_queue 스윕(cache:sweep)이 정리
+    - backend: MemoryCacheBackend(기본, 프로세스 내) / SQLiteCacheBackend(여러 봇 프로세스가 공유)
+    - hits/misses/expired/evictions 카운터와 stats()로 상태 확인
+    """
+
+    def __init__(self, ttl_sec: int = 600, max_entries: int = 4096, backend=None):
         self.ttl = ttl_sec
-        self.store: Dict[Tuple[int,int], Tuple[float, Any]] = {}
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def setup(self, app: Application, interval_sec: float = 60.0):
+        app.job_queue.run_repeating(
+            self._sweep, interval=interval_sec, first=interval_sec, name="cache:sweep"
+        )
 
     def put(self, chat_id: int, msg_id: int, payload: Any):
-        self.store[(chat_id, msg_id)] = (time.time(), payload)
+        self.evictions += self.backend.put((chat_id, msg_id), time.time() + self.ttl, payload)
 
     def get(self, chat_id: int, msg_id: int):
-        v = self.store.get((chat_id, msg_id))
-        if not v: return None
-        ts, payload = v
-        if time.time() - ts > self.ttl:
-            del self.store[(chat_id, msg_id)]
+        payload, expired = self.backend.get((chat_id, msg_id), time.time())
+        if payload is None:
+            self.misses += 1
+            self.expired += expired
             return None
+        self.hits += 1
         return payload
+
+    def delete(self, chat_id: int, msg_id: int):
+        self.backend.delete((chat_id, msg_id))
+
+    def sweep(self) -> int:
+        expired, evicted = self.backend.sweep(time.time())
+        self.expired += expired
+        self.evictions += evicted
+        return expired + evicted
+
+    async def _sweep(self, context: CallbackContext):
+        self.sweep()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
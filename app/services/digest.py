@@ -0,0 +1,77 @@
+# app/services/digest.py
+import datetime
+import itertools
+from typing import Optional
+
+from telegram.ext import Application, CallbackContext
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# '매일 HH:MM <메시지>' 중 오늘 일정 요약으로 처리할 메시지
+DIGEST_MESSAGES = {"오늘 일정", "오늘 일정 요약"}
+
+
+class DigestService:
+    """
+    매일 오늘 일정 요약 (다이제스트)
+
+    - 구독은 digest_subscriptions(user_id, hm)에 저장
+    - 사용자별 run_daily 대신 발송 시각(hm)마다 잡 하나 (digest:HHMM)
+    - 발송 시: 해당 시각 구독자 전원의 오늘 일정을 한 번의 범위 쿼리로 읽고
+      user_id 순으로 스트리밍하며 묶어 sender.send_daily로 전송 (Outbox가 속도 제한)
+    - 다중 워커면 (시각, 날짜) 단위로 선점한 워커만 발송
+      다른 워커가 받은 구독 시각은 임대 갱신 주기마다 sync()로 잡 추가
+    """
+
+    def __init__(self, repo, sender, shards=None):
+        self.repo = repo
+        self.sender = sender
+        self.shards = shards
+        self.app: Optional[Application] = None
+
+    def setup(self, app: Application):
+        self.app = app
+        self.sync()
+
+    def sync(self):
+        """DB의 구독 시각 중 잡이 없는 것만 등록"""
+        if not self.app:
+            return
+        for hm in self.repo.list_digest_times():
+            self._ensure_job(hm)
+
+    def subscribe(self, user_id: int, hm: str):
+        self.repo.add_digest_subscription(user_id, hm)
+        if self.app:
+            self._ensure_job(hm)
+
+    def _ensure_job(self, hm: str):
+        name = f"digest:{hm.replace(':', '')}"
+        if self.app.job_queue.get_jobs_by_name(name):
+            return
+        hh, mm = map(int, hm.split(":"))
+        self.app.job_queue.run_daily(
+            self._run,
+            time=datetime.time(hh, mm, tzinfo=KST),
+            name=name,
+            data=hm,
+        )
+
+    async def _run(self, context: CallbackContext):
+        hm = context.job.data
+        date = datetime.datetime.now(tz=KST).date().strftime("%Y-%m-%d")
+        # 여러 워커가 같은 잡을 갖고 있어도 한 워커만 발송
+        if self.shards is not None and not self.shards.claim_once(f"digest:{hm}:{date}"):
+            return
+        await self.fan_out(hm, date)
+
+    async def fan_out(self, hm: str, date: Optional[str] = None) -> int:
+        """hm 구독자 전원에게 date(기본: 오늘) 일정 요약 전송. 전송 대상 수 반환"""
+        date = date or datetime.datetime.now(tz=KST).date().strftime("%Y-%m-%d")
+        rows = self.repo.iter_digest_rows(hm, date)
+        count = 0
+        for user_id, group in itertools.groupby(rows, key=lambda r: r[0]):
+            items = [r[1:] for r in group if r[1] is not None]
+            await self.sender.send_daily(user_id, date, items)
+            count += 1
+        return count
@@ -0,0 +1,116 @@
+# app/services/dispatcher.py
+import heapq
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from telegram.ext import Application, CallbackContext
+
+FireCallback = Callable[[int, int], Awaitable[None]]
+
+_REMOVED = 0
+
+
+class PendingReminder:
+    """
+    힙 레코드 (reminder_id, user_id, fire_ts)
+    - reminder_id는 유일하므로 (fire_ts, reminder_id) 비교만으로 순서가 결정됨
+    - 취소 시 user_id를 _REMOVED로 바꾸는 지연 삭제(lazy deletion)
+    """
+
+    __slots__ = ("fire_ts", "reminder_id", "user_id")
+
+    def __init__(self, fire_ts: int, reminder_id: int, user_id: int):
+        self.fire_ts = fire_ts
+        self.reminder_id = reminder_id
+        self.user_id = user_id
+
+    def __lt__(self, other: "PendingReminder") -> bool:
+        if self.fire_ts != other.fire_ts:
+            return self.fire_ts < other.fire_ts
+        return self.reminder_id < other.reminder_id
+
+
+class ReminderDispatcher:
+    """
+    알림 디스패처 (min-heap + 단일 타이머)
+
+    - 알림마다 job_queue.run_once 잡/클로저를 만들지 않고 PendingReminder(__slots__) 레코드만 힙에 보관
+    - 하나의 반복 잡(tick)이 기한이 지난 레코드를 모두 꺼내 fire(reminder_id, user_id) 호출
+    - push: O(log n), cancel: O(1) 표시 후 pop 시 정리 (tombstone이 절반을 넘으면 재구성)
+    - 같은 reminder_id로 다시 push하면 기존 레코드는 취소됨
+    """
+
+    def __init__(self, fire: FireCallback, tick_sec: float = 1.0):
+        self._fire = fire
+        self.tick_sec = tick_sec
+        self._heap: List[PendingReminder] = []
+        self._entries: Dict[int, PendingReminder] = {}
+        self._removed = 0
+        self.app: Optional[Application] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, reminder_id: int) -> bool:
+        return reminder_id in self._entries
+
+    # ------------------------------ 힙 조작 ------------------------------
+
+    def push(self, reminder_id: int, user_id: int, fire_ts: float):
+        self.cancel(reminder_id)
+        entry = PendingReminder(int(fire_ts), reminder_id, user_id)
+        self._entries[reminder_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, reminder_id: int) -> bool:
+        entry = self._entries.pop(reminder_id, None)
+        if entry is None:
+            return False
+        entry.user_id = _REMOVED
+        self._removed += 1
+        if self._removed > 64 and self._removed * 2 > len(self._heap):
+            self._compact()
+        return True
+
+    def drop_users(self, predicate: Callable[[int], bool]) -> int:
+        """predicate(user_id)가 참인 레코드를 모두 취소 (샤드 반납 시)"""
+        victims = [rid for rid, e in self._entries.items() if predicate(e.user_id)]
+        for rid in victims:
+            self.cancel(rid)
+        return len(victims)
+
+    def _compact(self):
+        self._heap = [e for e in self._heap if e.user_id != _REMOVED]
+        heapq.heapify(self._heap)
+        self._removed = 0
+
+    def pop_due(self, now_ts: float) -> List[Tuple[int, int]]:
+        """now_ts 이전이 기한인 (reminder_id, user_id) 목록을 꺼냄"""
+        due = []
+        heap = self._heap
+        while heap and heap[0].fire_ts <= now_ts:
+            entry = heapq.heappop(heap)
+            if entry.user_id == _REMOVED:
+                self._removed -= 1
+                continue
+            del self._entries[entry.reminder_id]
+            due.append((entry.reminder_id, entry.user_id))
+        return due
+
+    def next_fire_ts(self) -> Optional[int]:
+        while self._heap and self._heap[0].user_id == _REMOVED:
+            heapq.heappop(self._heap)
+            self._removed -= 1
+        return self._heap[0].fire_ts if self._heap else None
+
+    # ------------------------------ 타이머 ------------------------------
+
+    def setup(self, app: Application):
+        self.app = app
+        app.job_queue.run_repeating(
+            self._tick, interval=self.tick_sec, first=self.tick_sec, name="reminder:dispatch"
+        )
+
+    async def _tick(self, context: CallbackContext):
+        for reminder_id, user_id in self.pop_due(time.time()):
+            self.app.create_task(self._fire(reminder_id, user_id))
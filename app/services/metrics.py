@@ -0,0 +1,250 @@
+# app/services/metrics.py
+"""
+표준 라이브러리만 쓰는 Prometheus 텍스트 형식 메트릭
+
+- Counter / Histogram: 라벨 값 튜플별로 누적
+- Gauge: 값을 직접 set 하거나, set_function으로 수집 시점에 읽음 (job_queue 크기 등)
+- timed(hist, label): 동기/비동기 함수 모두 감싸 소요 시간 기록 (예외는 그대로 전파)
+- serve(addr, port): 데몬 스레드의 HTTP 서버가 GET /metrics 에 REGISTRY.render() 응답
+"""
+import asyncio
+import bisect
+import functools
+import inspect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = ['%s="%s"' % (n, _esc(v)) for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_fmt_labels(self.labels, k)} {v}" for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = _DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 → [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(label_values)
+            if row is None:
+                row = self._values[label_values] = [0.0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = self._header()
+        for k, row in items:
+            acc = 0.0
+            for le, n in zip(self.buckets, row):
+                acc += n
+                le_label = 'le="%s"' % le
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, le_label)} {acc}")
+            inf_label = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, inf_label)} {row[-1]}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, k)} {row[-2]}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, k)} {row[-1]}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, *label_values: str):
+        with self._lock:
+            self._values[label_values] = value
+
+    def set_function(self, fn: Callable[[], float], *label_values: str):
+        with self._lock:
+            self._functions[label_values] = fn
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+            fns = list(self._functions.items())
+        for k, fn in fns:
+            try:
+                items.append((k, float(fn())))
+            except Exception:
+                continue  # 수집 중 오류는 해당 값만 생략
+        return self._header() + [
+            f"{self.name}{_fmt_labels(self.labels, k)} {v}" for k, v in items
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in list(self._metrics.values()):
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ====== 메트릭 정의 ======
+HANDLER_SECONDS = REGISTRY.register(Histogram(
+    "bot_handler_seconds", "명령/콜백 처리 시간 (대기 포함)", ("handler",)))
+HANDLER_ERRORS = REGISTRY.register(Counter(
+    "bot_handler_errors_total", "예외로 끝난 명령/콜백 수", ("handler",)))
+DB_SECONDS = REGISTRY.register(Histogram(
+    "db_query_seconds", "ScheduleRepo 메서드별 SQLite 소요 시간", ("method",)))
+AI_SECONDS = REGISTRY.register(Histogram(
+    "ai_chat_seconds", "OpenAI chat 호출 시간", (), buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32)))
+AI_ERRORS = REGISTRY.register(Counter("ai_chat_errors_total", "OpenAI chat 호출 실패 수"))
+SEND_SECONDS = REGISTRY.register(Histogram(
+    "bot_send_seconds", "텔레그램 sendMessage 소요 시간"))
+SENDS = REGISTRY.register(Counter(
+    "bot_sends_total", "메시지 발송 결과 (ok/retry/failed)", ("result",)))
+REMINDERS_FIRED = REGISTRY.register(Counter(
+    "reminders_fired_total", "알림 발송 결과 (sent/dropped/missing/claimed_elsewhere)", ("result",)))
+SIZE = REGISTRY.register(Gauge(
+    "bot_component_size", "큐/캐시 크기 (job_queue, dispatcher, outbox, 캐시 등)", ("component",)))
+ADMISSION = REGISTRY.register(Gauge(
+    "bot_admission_total", "유입 제한 결과 누계", ("klass", "result")))
+
+BACKUP_SECONDS = REGISTRY.register(Histogram(
+    "db_backup_seconds", "온라인 백업 1회 소요 시간 (복사+검사+압축)", (),
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)))
+BACKUPS = REGISTRY.register(Counter("db_backups_total", "백업 결과 (ok/failed)", ("result",)))
+BACKUP_BYTES = REGISTRY.register(Gauge(
+    "db_backup_bytes", "마지막 백업 크기 (db: 압축 전, gz: 압축 후)", ("kind",)))
+
+
+# ====== 계측 래퍼 ======
+def timed(hist: Histogram, *label_values: str, errors: Optional[Counter] = None):
+    def deco(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def awrapper(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    if errors is not None:
+                        errors.inc(*label_values)
+                    raise
+                finally:
+                    hist.observe(time.perf_counter() - t0, *label_values)
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if errors is not None:
+                    errors.inc(*label_values)
+                raise
+            finally:
+                hist.observe(time.perf_counter() - t0, *label_values)
+        return wrapper
+    return deco
+
+
+def instrument_methods(hist: Histogram, exclude: Sequence[str] = ()):
+    """클래스 데코레이터: 공개 메서드(제너레이터 제외)를 메서드 이름 라벨로 계측"""
+    def deco(cls):
+        for name, fn in list(vars(cls).items()):
+            if name.startswith("_") or name in exclude or not inspect.isfunction(fn):
+                continue
+            if inspect.isgeneratorfunction(fn):
+                continue
+            setattr(cls, name, timed(hist, name)(fn))
+        return cls
+    return deco
+
+
+def track_handler(name: str, fn):
+    return timed(HANDLER_SECONDS, name, errors=HANDLER_ERRORS)(fn)
+
+
+# ====== HTTP 노출 ======
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 스크레이프마다 로그 남기지 않음
+
+
+def serve(addr: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,242 @@
+# app/services/outbox.py
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from telegram.error import NetworkError, RetryAfter, TelegramError, TimedOut
+from telegram.ext import Application, CallbackContext
+
+from app.services.metrics import SEND_SECONDS, SENDS
+from app.services.ratelimit import TokenBucket
+
+log = logging.getLogger(__name__)
+
+# 낮을수록 먼저 전송
+PRIORITY_REMINDER = 0  # 시각이 중요한 알림
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2      # 다이제스트 등 대량 발송
+
+
+class _Outgoing:
+    __slots__ = ("chat_id", "parts", "priority", "seq", "attempts", "coalesce_key", "kwargs",
+                 "results")
+
+    def __init__(self, chat_id: int, text: str, priority: int, seq: int,
+                 coalesce_key: Optional[Tuple[int, int, int]], kwargs: dict):
+        self.chat_id = chat_id
+        self.parts: List[str] = [text]
+        self.priority = priority
+        self.seq = seq
+        self.attempts = 0
+        self.coalesce_key = coalesce_key
+        self.kwargs = kwargs
+        self.results: List[asyncio.Future] = []  # put() 호출마다 하나 (병합되면 여러 개)
+
+    def settle(self, ok: bool):
+        for fut in self.results:
+            if not fut.done():
+                fut.set_result(ok)
+
+
+class Outbox:
+    """
+    속도 제한 + 병합 발송 큐
+
+    - 전역/채팅별 토큰 버킷 (텔레그램: 전역 ~30 msg/s, 채팅당 ~1 msg/s)
+    - 우선순위 큐: 알림(PRIORITY_REMINDER)이 일반/대량 메시지보다 먼저 나감
+    - 병합: coalesce=True 메시지는 같은 사용자 + 같은 분(minute) + 같은 우선순위로 대기 중인 메시지와 한 통으로 합침
+      (큐에 들어간 뒤에는 우선순위를 바꾸지 않음 → 힙 순서 유지)
+    - 429(RetryAfter)는 retry_after 만큼 쉬었다가 재시도, 네트워크 오류는 지수 백오프
+    - 응답 시간 초과(TimedOut)는 이미 전달됐을 수 있어 재시도하지 않음 (중복 발송 방지)
+    - put() 은 전송 결과 Future 반환: True = 텔레그램이 받음, False = 버림(실패/재시도 초과/시간 초과/종료)
+      → 호출 측이 전달 상태를 결과에 맞춰 기록 (알림은 False 면 미전달로 남겨 보충 발송 대상)
+    - stop(): 최대 drain_sec 동안 대기열을 비운 뒤 전송 루프 종료, 남은 메시지는 False 로 통보 (post_stop 에 연결)
+    """
+
+    def __init__(self, app: Application, global_rate: float = 25.0,
+                 chat_rate: float = 1.0, chat_burst: float = 3.0,
+                 max_attempts: int = 5, concurrency: int = 8, drain_sec: float = 10.0):
+        self.app = app
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_attempts = max_attempts
+        self.drain_sec = drain_sec
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+        self._ready: List[Tuple[int, int, _Outgoing]] = []      # (priority, seq, msg)
+        self._delayed: List[Tuple[float, int, _Outgoing]] = []  # (not_before, seq, msg)
+        self._coalesce: Dict[Tuple[int, int, int], _Outgoing] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+        self._deliveries: Set[asyncio.Task] = set()
+        self.sent = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        return len(self._ready) + len(self._delayed)
+
+    # ------------------------------ 시작 ------------------------------
+
+    def setup(self, app: Application):
+        self.app = app
+        app.job_queue.run_once(self._start, when=0, name="outbox:start")
+        prev = app.post_stop
+
+        async def post_stop(application: Application):
+            await self.stop()
+            if prev is not None:
+                await prev(application)
+
+        app.post_stop = post_stop
+
+    async def _start(self, context: CallbackContext):
+        self._wakeup = asyncio.Event()
+        self._inflight = asyncio.Semaphore(self._concurrency)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        대기열을 최대 drain_sec 동안 계속 전송 → 전송 루프 종료 → 전송 중인 메시지 완료 대기
+        그래도 남은 메시지는 결과 False 로 통보 (호출 측이 미전달로 처리)
+        """
+        if self._task is not None:
+            deadline = time.monotonic() + self.drain_sec
+            while (len(self) or self._deliveries) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+        left = [msg for _, _, msg in self._ready] + [msg for _, _, msg in self._delayed]
+        if left:
+            log.warning("outbox stopped with %d queued message(s) unsent", len(left))
+            SENDS.inc("failed", amount=len(left))
+            self.failed += len(left)
+        for msg in left:
+            msg.settle(False)
+        self._ready.clear()
+        self._delayed.clear()
+        self._coalesce.clear()
+
+    # ------------------------------ 적재 ------------------------------
+
+    def put(self, chat_id: int, text: str, priority: int = PRIORITY_NORMAL,
+            coalesce: bool = False, **kwargs) -> asyncio.Future:
+        """큐에 적재 후 전송 결과 Future(bool) 반환 (기다리지 않아도 됨)"""
+        result = asyncio.get_running_loop().create_future()
+        key = None
+        if coalesce and not kwargs:
+            key = (chat_id, int(time.time() // 60), priority)
+            pending = self._coalesce.get(key)
+            if pending is not None:
+                pending.parts.append(text)
+                pending.results.append(result)
+                return result
+        msg = _Outgoing(chat_id, text, priority, next(self._seq), key, kwargs)
+        msg.results.append(result)
+        if key is not None:
+            self._coalesce[key] = msg
+        heapq.heappush(self._ready, (msg.priority, msg.seq, msg))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return result
+
+    def _defer(self, msg: _Outgoing, delay: float):
+        heapq.heappush(self._delayed, (time.monotonic() + delay, msg.seq, msg))
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        b = self._chat_buckets.get(chat_id)
+        if b is None:
+            if len(self._chat_buckets) > 10000:
+                self._chat_buckets = {
+                    k: v for k, v in self._chat_buckets.items() if not v.is_full()
+                }
+            b = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return b
+
+    # ------------------------------ 전송 루프 ------------------------------
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, msg = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, (msg.priority, msg.seq, msg))
+
+            if not self._ready:
+                timeout = self._delayed[0][0] - now if self._delayed else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, msg = heapq.heappop(self._ready)
+            chat_bucket = self._chat_bucket(msg.chat_id)
+            if not chat_bucket.try_acquire():
+                self._defer(msg, chat_bucket.wait_time())
+                continue
+
+            await self.global_bucket.acquire()
+            # 전송 직전에 병합 대상에서 제외 (이후 들어온 메시지는 새 메시지로)
+            if msg.coalesce_key is not None and self._coalesce.get(msg.coalesce_key) is msg:
+                del self._coalesce[msg.coalesce_key]
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._deliver(msg))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, msg: _Outgoing):
+        t0 = time.perf_counter()
+        try:
+            await self.app.bot.send_message(
+                chat_id=msg.chat_id, text="\n".join(msg.parts), **msg.kwargs
+            )
+            self.sent += 1
+            SENDS.inc("ok")
+            msg.settle(True)
+        except RetryAfter as e:
+            delay = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") \
+                else float(e.retry_after)
+            self.global_bucket.pause(delay)
+            self._retry(msg, delay, e)
+        except TimedOut as e:
+            # 요청은 서버에 도달했을 수 있음 → 재시도하면 두 번 갈 수 있으므로 포기
+            self.failed += 1
+            SENDS.inc("failed")
+            log.warning("send to %s timed out, not retried: %s", msg.chat_id, e)
+            msg.settle(False)
+        except NetworkError as e:
+            self._retry(msg, min(2 ** msg.attempts, 60), e)
+        except TelegramError as e:
+            # 차단/잘못된 요청 등은 재시도해도 소용 없음
+            self.failed += 1
+            SENDS.inc("failed")
+            log.warning("send to %s dropped: %s", msg.chat_id, e)
+            msg.settle(False)
+        finally:
+            SEND_SECONDS.observe(time.perf_counter() - t0)
+            self._inflight.release()
+
+    def _retry(self, msg: _Outgoing, delay: float, err: Exception):
+        msg.attempts += 1
+        if msg.attempts >= self.max_attempts:
+            self.failed += 1
+            SENDS.inc("failed")
+            log.warning("send to %s failed after %d attempts: %s", msg.chat_id, msg.attempts, err)
+            msg.settle(False)
+            return
+        SENDS.inc("retry")
+        self._defer(msg, delay)
+        self._wakeup.set()
@@ -0,0 +1,57 @@
+# app/services/ratelimit.py
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    토큰 버킷
+    - rate: 초당 보충 토큰 수
+    - capacity: 최대 적립(버스트) 크기
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        self._refill(time.monotonic())
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+    def wait_time(self, n: float = 1.0) -> float:
+        """n개 토큰이 찰 때까지 남은 시간(초)"""
+        self._refill(time.monotonic())
+        if self.tokens >= n:
+            return 0.0
+        return (n - self.tokens) / self.rate
+
+    def reserve(self, n: float = 1.0) -> float:
+        """토큰을 먼저 차감(음수 허용)하고, 차례가 올 때까지 기다릴 시간(초) 반환 → 도착 순서대로 대기"""
+        self._refill(time.monotonic())
+        self.tokens -= n
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def pause(self, seconds: float):
+        """서버가 retry_after를 주면 그 동안 토큰을 비워 둠"""
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+    async def acquire(self, n: float = 1.0):
+        while not self.try_acquire(n):
+            await asyncio.sleep(self.wait_time(n))
@@ -1,10 +1,23 @@
 # app/services/reminder.py
+import asyncio
 import datetime
+import itertools
+import logging
 import re
-from typing import Optional, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 
 from telegram.ext import Application, CallbackContext
 
+from app.services.digest import DIGEST_MESSAGES
+from app.services.dispatcher import ReminderDispatcher
+from app.services.metrics import REMINDERS_FIRED
+from app.services.outbox import PRIORITY_REMINDER
+from app.services.timeutil import kst_epoch
+from app.storage.rows import ScheduleRow
+
+log = logging.getLogger(__name__)
+
 KST = datetime.timezone(datetime.timedelta(hours=9))
 
 # 0=월, 6=일
@@ -21,6 +34,31 @@ def _next_weekday_date(from_date: datetime.date, weekday: int) -> datetime.date:
     return from_date + datetime.timedelta(days=delta)
 
 
+_BOT_DATA_KEY = "reminder_service"
+
+
+class CustomJobPayload:
+    """/remind 반복 잡의 job.data (잡마다 클로저 대신 공용 콜백 + 슬롯 객체)"""
+
+    __slots__ = ("chat_id", "message")
+
+    def __init__(self, chat_id: int, message: str):
+        self.chat_id = chat_id
+        self.message = message
+
+
+async def _run_custom_job(context: CallbackContext):
+    """모든 /remind 잡이 공유하는 모듈 수준 콜백"""
+    service: "ReminderService" = context.application.bot_data[_BOT_DATA_KEY]
+    payload: CustomJobPayload = context.job.data
+    await service._send_custom_message(payload.chat_id, payload.message)
+
+
+def _fire_ts(dt_str: str, tm_str: Optional[str], offset_minutes: int) -> int:
+    """일정 날짜/시간(없으면 09:00, KST) - offset → 발송 시각 epoch seconds"""
+    return kst_epoch(dt_str, tm_str, offset_minutes)
+
+
 def dday_text(date_str: str, tz: datetime.tzinfo = KST) -> str:
     """YYYY-MM-DD → (D-N / D-DAY / D+N)"""
     today = datetime.datetime.now(tz=tz).date()
@@ -42,54 +80,131 @@ class ReminderService:
        - '매일 HH:MM 메세지'
        - '매주 요일 HH:MM 메세지'
        - '매주 요일 메세지' (시간 생략 시 09:00)
+       - '매일 HH:MM 오늘 일정'은 DigestService 구독으로 처리 (실제 오늘 일정 요약 전송)
 
     2) 일정별 알림 예약 (버튼 rset:<sid>:<offset>)
        - offset_minutes: 0(정각), 30, 60, 1440(하루 전) 등
+       - 알림별 PTB 잡 대신 ReminderDispatcher 힙에 (알림id, 사용자id, 발송시각)만 보관
 
     3) 복구
        - 앱 시작 후 DB에 저장된 reminders를 읽어 다시 스케줄
+       - 중단 중 발송 시각이 지난 알림은 catchup_grace_sec 이내만 사용자별 한 통으로 묶어 보충 발송
+       - delivered_at 은 Outbox 가 실제로 보낸 뒤에만 기록 (버려지면 미전달로 남아 다음 보충 발송 대상)
+       - shards(ShardCoordinator)가 있으면 보유한 샤드의 사용자 알림만 복구하고
+         (새로 만든 알림은 만든 워커도 바로 스케줄), 발송 직전 dispatch_claims 선점에 성공한 워커만 전송 (최대 1회)
+
+    4) 레지스트리 (멱등)
+       - 일정별 알림은 디스패처에서 reminder_id로, /remind 잡은 안정 키로 관리
+       - 같은 알림을 다시 등록하면 기존 것을 교체, 행 삭제 시 예약도 함께 취소
 
     주의
     ----
-    - sender.app.bot.send_message 사용 (sender는 PTBSender처럼 app 보유)
+    - sender.send 사용 (PTBSender: Outbox를 통해 속도 제한/같은 분 알림 병합)
     - repo는 ScheduleRepo 구현체여야 함
     """
 
-    def __init__(self, repo, sender):
+    def __init__(self, repo, sender, digest=None, shards=None,
+                 catchup_grace_sec: float = 3600, catchup_max: int = 500):
         self.repo = repo
         self.sender = sender
+        self.digest = digest
+        self.shards = shards  # ShardCoordinator or None(단일 프로세스)
+        self.catchup_grace_sec = catchup_grace_sec
+        self.catchup_max = catchup_max
         self.app: Optional[Application] = None
+        self.dispatcher = ReminderDispatcher(self._fire)
+        self._max_seen_id = 0
+        # /remind 반복 잡 레지스트리: 안정 키(daily:<chat>:<HHMM> 등) → PTB Job
+        self._custom_jobs: Dict[str, object] = {}
 
     # ------------------------------ 초기화/복구 ------------------------------
 
     def setup(self, app: Application):
         """애플리케이션 연결 및 부팅 복구 예약"""
         self.app = app
-        # 부팅 직후 DB에 저장된 reminders 복구
-        app.job_queue.run_once(self._restore_all, when=1.0)
+        app.bot_data[_BOT_DATA_KEY] = self
+        self.dispatcher.setup(app)
+        if self.shards is None:
+            # 단일 프로세스: 부팅 직후 DB에 저장된 reminders 전체 복구
+            app.job_queue.run_once(self._restore_all, when=1.0)
+        else:
+            # 다중 워커: 임대 연장/인수 주기마다 보유 샤드의 알림 적재
+            app.job_queue.run_repeating(
+                self._rebalance, interval=self.shards.ttl / 3, first=1.0, name="reminder:leases"
+            )
 
     async def _restore_all(self, context: CallbackContext):
+        """모든 사용자의 reminders 복구 (일정 조인 한 번의 쿼리)"""
+        await self._catch_up()
+        self._load_pending(self.repo.list_pending_reminders())
+
+    async def _rebalance(self, context: CallbackContext):
         """
-        모든 사용자에 대해 reminders 복구.
-        간단 구현: schedules에서 DISTINCT user_id를 추출 후 각 사용자의 reminders를 복구.
+        샤드 임대 갱신
+        - 잃은 샤드의 알림은 디스패처에서 제거 (새 주인이 적재)
+        - 새로 얻은 샤드는 전체 적재, 기존 샤드는 마지막으로 본 id 이후(다른 워커가 추가한 알림)만 적재
+        - 다른 워커에서 생긴 다이제스트 구독 시각도 잡으로 등록 (발송은 시각/날짜 선점으로 한 번만)
         """
-        import sqlite3
-
-        with sqlite3.connect(self.repo.db.path) as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT DISTINCT user_id FROM schedules")
-            users = [row[0] for row in cur.fetchall()]
+        if self.digest is not None:
+            self.digest.sync()
+        gained, lost = self.shards.rebalance()
+        if lost:
+            self.dispatcher.drop_users(lambda uid: self.shards.shard_of(uid) in lost)
+        # 새 샤드 적재가 _max_seen_id 를 올리기 전의 값 기준 (그 사이 기존 샤드에 추가된 낮은 id 를 놓치지 않도록)
+        prev_seen = self._max_seen_id
+        kept = self.shards.owned - gained
+        if kept:
+            self._load_pending(
+                self.repo.list_pending_reminders(
+                    self.shards.shard_count, kept, after_id=prev_seen
+                )
+            )
+        if gained:
+            await self._catch_up(gained)
+            self._load_pending(
+                self.repo.list_pending_reminders(self.shards.shard_count, gained)
+            )
 
-        for uid in users:
-            try:
-                reminders = self.repo.list_reminders_for_user(uid)  # [(id, schedule_id, offset_minutes), ...]
-            except Exception:
+    async def _catch_up(self, shards=None):
+        """
+        놓친 알림 보충 발송
+        - 전달 안 된 알림 중 fire_at이 [now - grace, now]인 것을 한 번의 인덱스 쿼리로 (최대 catchup_max건)
+        - 사용자별로 한 통으로 합쳐 일반 우선순위로 전송 → Outbox 속도 제한 안에서 정시 알림보다 뒤로
+        """
+        now = time.time()
+        rows = self.repo.list_missed_reminders(
+            now - self.catchup_grace_sec, now,
+            self.shards.shard_count if shards is not None else None, shards,
+            limit=self.catchup_max,
+        )
+        for user_id, group in itertools.groupby(rows, key=lambda r: r[1]):
+            rids, lines = [], []
+            for rid, _uid, title, dt_str, tm_str in group:
+                if self.shards is not None and not self.shards.claim_once(f"r:{rid}"):
+                    continue
+                rids.append(rid)
+                lines.append(f"- {dt_str} {tm_str or ''} {title} {dday_text(dt_str, tz=KST)}")
+            if not rids:
                 continue
+            body = f"⏰ 놓친 알림 {len(rids)}건\n" + "\n".join(lines)
+            result = await self.sender.send(user_id, body)
+            result.add_done_callback(lambda f, rids=rids: self._settle(rids, f))
 
-            for rid, sid, offset in reminders:
-                row = self.repo.get(uid, sid)  # (id,title,desc,date,time) or None
-                if row:
-                    await self._schedule_one(uid, row, offset, rid)
+    def _load_pending(self, rows):
+        """
+        DB에 저장된 fire_at(epoch)을 그대로 사용 → 행마다 날짜 파싱 없음
+        (지난 알림은 쿼리에서 이미 제외, fire_at 이 NULL 인 예전 행만 여기서 계산/비교)
+        """
+        now = time.time()
+        for rid, uid, fire_at, offset, dt_str, tm_str in rows:
+            if rid > self._max_seen_id:
+                self._max_seen_id = rid
+            if fire_at is None:
+                fire_at = _fire_ts(dt_str, tm_str, offset)
+                if fire_at <= now:
+                    continue
+            if rid not in self.dispatcher:
+                self.dispatcher.push(rid, uid, fire_at)
 
     # ------------------------------ 자연어 알림 (/remind) ------------------------------
 
@@ -138,7 +253,7 @@ class ReminderService:
 
     async def _send_custom_message(self, chat_id: int, message: str):
         """단순 커스텀 메시지 전송"""
-        await self.sender.app.bot.send_message(chat_id=chat_id, text=message)
+        await self.sender.send(chat_id, message, priority=PRIORITY_REMINDER, coalesce=True)
 
     async def schedule_custom(self, chat_id: int, text: str) -> str:
         """
@@ -151,13 +266,19 @@ class ReminderService:
 
         mode, weekday, t, msg = self._parse_remind_text(text)
 
+        if mode == "daily" and self.digest and msg in DIGEST_MESSAGES:
+            self.digest.subscribe(chat_id, t.strftime("%H:%M"))
+            return f"매일 {t.strftime('%H:%M')} - 오늘 일정 요약"
+
         if mode == "daily":
-            self.app.job_queue.run_daily(
-                lambda ctx: self.app.create_task(self._send_custom_message(chat_id, msg)),
+            key = f"daily:{chat_id}:{t.strftime('%H%M')}"
+            self._register_custom(key, self.app.job_queue.run_daily(
+                _run_custom_job,
                 time=t,
-                name=f"daily:{chat_id}:{t.strftime('%H%M')}",
+                name=key,
                 chat_id=chat_id,
-            )
+                data=CustomJobPayload(chat_id, msg),
+            ))
             return f"매일 {t.strftime('%H:%M')} - '{msg}'"
 
         if mode == "weekly":
@@ -165,77 +286,117 @@ class ReminderService:
             first_date = _next_weekday_date(datetime.datetime.now(tz=KST).date(), weekday)
             first_dt = datetime.datetime.combine(first_date, t).astimezone(KST)
 
-            async def _weekly_send(ctx: CallbackContext):
-                await self._send_custom_message(chat_id, msg)
-
-            # 첫 실행 예약
-            self.app.job_queue.run_once(
-                lambda ctx: self.app.create_task(_weekly_send(ctx)),
-                when=first_dt,
-                name=f"weekly_once:{chat_id}:{weekday}:{t.strftime('%H%M')}",
-            )
-            # 이후 매주 반복
-            self.app.job_queue.run_repeating(
-                lambda ctx: self.app.create_task(_weekly_send(ctx)),
+            # 첫 실행 후 매주 반복
+            key = f"weekly:{chat_id}:{weekday}:{t.strftime('%H%M')}"
+            self._register_custom(key, self.app.job_queue.run_repeating(
+                _run_custom_job,
                 interval=datetime.timedelta(days=7),
-                first=first_dt + datetime.timedelta(days=7),
-                name=f"weekly:{chat_id}:{weekday}:{t.strftime('%H%M')}",
+                first=first_dt,
+                name=key,
                 chat_id=chat_id,
-            )
+                data=CustomJobPayload(chat_id, msg),
+            ))
             wd_kor = [k for k, v in _KOR_WEEKDAY.items() if v == weekday and len(k) == 1][0]  # 월/화/...
             return f"매주 {wd_kor}요일 {t.strftime('%H:%M')} - '{msg}'"
 
         raise ValueError("알 수 없는 모드")
 
+    def _register_custom(self, key: str, job):
+        """같은 키의 기존 잡은 제거하고 새 잡으로 교체"""
+        old = self._custom_jobs.pop(key, None)
+        if old is not None:
+            old.schedule_removal()
+        self._custom_jobs[key] = job
+
+    def cancel_custom(self, chat_id: int) -> int:
+        """chat_id 의 /remind 반복 잡(daily:<chat>:…, weekly:<chat>:…) 모두 제거 → 제거한 개수"""
+        keys = [k for k in self._custom_jobs if k.split(":", 2)[1] == str(chat_id)]
+        for key in keys:
+            self._custom_jobs.pop(key).schedule_removal()
+        return len(keys)
+
     # ------------------------------ 일정별 알림 ------------------------------
 
-    async def schedule_for_schedule(self, user_id: int, schedule_row, offset_minutes: int):
+    async def schedule_for_schedule(self, user_id: int, schedule_row: ScheduleRow, offset_minutes: int):
         """
         일정건에 대한 알림 예약 + DB 저장
-        schedule_row: (id, title, desc, date, time)
+        schedule_row: ScheduleRow
         offset_minutes: 0(정각), 30, 60, 1440(하루 전) 등
         """
-        reminder_id = self.repo.add_reminder(user_id, schedule_row[0], offset_minutes)
+        fire_at = _fire_ts(schedule_row.date, schedule_row.time, offset_minutes)
+        # 같은 일정/오프셋 알림이 있으면 재사용 (버튼 중복 클릭)
+        reminder_id = self.repo.find_reminder(user_id, schedule_row.id, offset_minutes)
+        if reminder_id is None:
+            reminder_id = self.repo.add_reminder(user_id, schedule_row.id, offset_minutes, fire_at)
         await self._schedule_one(user_id, schedule_row, offset_minutes, reminder_id)
 
-    async def _schedule_one(self, user_id: int, schedule_row, offset_minutes: int, reminder_id: int):
+    # ------------------------------ 삭제 (DB 행 + 예약 취소) ------------------------------
+
+    def delete_reminder(self, user_id: int, reminder_id: int) -> bool:
+        ok = self.repo.delete_reminder(user_id, reminder_id)
+        if ok:
+            self.dispatcher.cancel(reminder_id)
+        return ok
+
+    def delete_for_schedule(self, user_id: int, schedule_id: int):
+        rids = self.repo.list_reminder_ids(user_id, schedule_id)
+        self.repo.delete_reminders_for_schedule(user_id, schedule_id)
+        self._cancel_many(rids)
+
+    def forget_user(self, user_id: int):
+        """전체 삭제 전 호출: 사용자의 일정별 알림 예약과 /remind 반복 잡 모두 취소"""
+        self._cancel_many(self.repo.list_reminder_ids(user_id))
+        self.cancel_custom(user_id)
+
+    def _cancel_many(self, reminder_ids: List[int]):
+        for rid in reminder_ids:
+            self.dispatcher.cancel(rid)
+
+    async def _schedule_one(self, user_id: int, schedule_row: ScheduleRow, offset_minutes: int,
+                            reminder_id: int):
         """
         하나의 알림을 실제 스케줄러에 등록
         - 시간 없으면 기본 09:00
         - 트리거 시간이 과거면 스킵
+        - 다중 워커: 샤드 주인이 아니어도 만든 워커가 바로 적재 (주인은 다음 rebalance 에서 적재)
+          두 워커가 모두 갖고 있어도 발송 시 r:<id> 선점으로 한 번만 전송
         """
         if not self.app:
             return
 
-        sid, title, desc, dt_str, tm_str = schedule_row
+        self._push(reminder_id, user_id, _fire_ts(schedule_row.date, schedule_row.time, offset_minutes))
 
-        # 일정 시간 계산 (없으면 09:00)
-        if tm_str:
-            hh, mm = map(int, tm_str.split(":"))
-        else:
-            hh, mm = 9, 0
-
-        event_dt = datetime.datetime.strptime(f"{dt_str} {hh:02d}:{mm:02d}", "%Y-%m-%d %H:%M")
-        event_dt = event_dt.replace(tzinfo=KST)
-
-        # 오프셋 적용
-        fire_dt = event_dt - datetime.timedelta(minutes=offset_minutes)
-
-        # 이미 지난 경우 스킵
-        if fire_dt <= datetime.datetime.now(tz=KST):
+    def _push(self, reminder_id: int, user_id: int, fire_ts: int):
+        # 이미 지난 경우 스킵 (재시작 시 _catch_up이 보충)
+        if fire_ts <= time.time():
             return
+        self.dispatcher.push(reminder_id, user_id, fire_ts)
 
-        name = f"reminder:{reminder_id}"
-
-        async def _send(ctx: CallbackContext):
-            tail = dday_text(dt_str, tz=KST)
-            body = f"🔔 알림: {dt_str} {tm_str or ''} {title} {tail}"
-            await self.sender.app.bot.send_message(chat_id=user_id, text=body)
-
-        # 예약
-        self.app.job_queue.run_once(
-            lambda ctx: self.app.create_task(_send(ctx)),
-            when=fire_dt,
-            name=name,
-            chat_id=user_id,
-        )
+    async def _fire(self, reminder_id: int, user_id: int):
+        """디스패처 콜백: 발송 시점에 DB에서 일정 정보를 읽어 전송 (삭제된 알림은 무시)"""
+        row = self.repo.get_reminder_detailed(user_id, reminder_id)
+        if not row:
+            REMINDERS_FIRED.inc("missing")
+            return
+        if self.shards is not None and not self.shards.claim_once(f"r:{reminder_id}"):
+            REMINDERS_FIRED.inc("claimed_elsewhere")
+            return  # 다른 워커가 이미 선점
+        tail = dday_text(row.date, tz=KST)
+        body = f"🔔 알림: {row.date} {row.time or ''} {row.title} {tail}"
+        result = await self.sender.send(user_id, body, priority=PRIORITY_REMINDER, coalesce=True)
+        result.add_done_callback(lambda f: self._settle([reminder_id], f))
+
+    def _settle(self, reminder_ids: List[int], result: asyncio.Future):
+        """
+        전송 결과 콜백 (Outbox 가 실제로 보냈거나 포기한 시점)
+        - 성공: 전달 처리
+        - 버려짐: 미전달로 두고 선점 해제 → 재시작/샤드 인수 때 _catch_up 이 다시 보냄
+        """
+        if not result.cancelled() and result.result():
+            self.repo.mark_reminders_delivered(reminder_ids)
+            REMINDERS_FIRED.inc("sent", amount=len(reminder_ids))
+            return
+        REMINDERS_FIRED.inc("dropped", amount=len(reminder_ids))
+        log.warning("reminders %s not delivered, left for catch-up", reminder_ids)
+        if self.shards is not None:
+            self.shards.release([f"r:{rid}" for rid in reminder_ids])
@@ -0,0 +1,70 @@
+# app/services/sharding.py
+import logging
+import math
+import os
+import socket
+import uuid
+from typing import Set, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class ShardCoordinator:
+    """
+    다중 워커 알림 샤딩
+
+    - 사용자는 user_id % shard_count 샤드에 속함
+    - 각 워커는 reminder_workers에 하트비트를 남기고, reminder_leases에서 만료 시각이 있는 임대를 잡고 주기적으로 연장
+    - 살아있는 워커 수로 공정 분배(ceil(N / workers))를 계산해 모자라면 빈 샤드를 잡고, 넘치면 반납
+    - 워커가 죽으면 임대가 만료되어 다른 워커가 다음 rebalance에서 인수
+    - 실제 발송 직전 claim_once로 선점 → 임대가 겹치는 순간에도 최대 1회 발송
+    """
+
+    def __init__(self, lease_repo, worker_id: str = "", shard_count: int = 16,
+                 ttl_sec: float = 30.0):
+        self.repo = lease_repo
+        self.worker_id = worker_id or default_worker_id()
+        self.shard_count = shard_count
+        self.ttl = ttl_sec
+        self.owned: Set[int] = set()
+        self.repo.ensure_shards(shard_count)
+
+    def shard_of(self, user_id: int) -> int:
+        return user_id % self.shard_count
+
+    def owns(self, user_id: int) -> bool:
+        return self.shard_of(user_id) in self.owned
+
+    def rebalance(self) -> Tuple[Set[int], Set[int]]:
+        """임대 연장/획득/반납 후 (새로 얻은 샤드, 잃은 샤드) 반환"""
+        held = set(self.repo.renew(self.worker_id, self.ttl))
+        owners = set(self.repo.live_workers()) | {self.worker_id}
+        fair = math.ceil(self.shard_count / len(owners))
+
+        if len(held) > fair:
+            for shard in sorted(held)[fair:]:
+                self.repo.release_shard(shard, self.worker_id)
+                held.discard(shard)
+        elif len(held) < fair:
+            for shard in self.repo.free_shards():
+                if len(held) >= fair:
+                    break
+                if self.repo.try_claim_shard(shard, self.worker_id, self.ttl):
+                    held.add(shard)
+
+        gained, lost = held - self.owned, self.owned - held
+        if gained or lost:
+            log.info("worker %s shards: +%s -%s (now %d)",
+                     self.worker_id, sorted(gained), sorted(lost), len(held))
+        self.owned = held
+        return gained, lost
+
+    def claim_once(self, key: str) -> bool:
+        return self.repo.claim(key, self.worker_id)
+
+    def release(self, keys):
+        self.repo.release_claims(keys, self.worker_id)
@@ -0,0 +1,231 @@
+# app/services/suggester.py
+import datetime
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from app.domain.suggestion import Suggestion
+
+# numpy / pydantic 은 처음 필요할 때 import (봇 기동 시간에서 제외)
+np = None
+_np_tried = False
+
+
+def _numpy():
+    """numpy 모듈 (미설치면 None → 순수 파이썬 스윕으로 동작)"""
+    global np, _np_tried
+    if not _np_tried:
+        _np_tried = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+_DAY = 1440  # 분
+
+
+def _hm_to_min(hm: str) -> int:
+    hh, mm = hm.split(":")
+    return int(hh) * 60 + int(mm)
+
+
+class FreeSlotFinder:
+    """
+    빈 시간대 계산기 (LLM 호출 없음)
+
+    동작
+    ----
+    1) 기간 [start_date, start_date + days) 를 '기간 시작 0시 기준 분' 타임라인으로 펼친다.
+    2) 일정(시간 있는 것) + 업무시간 외 구간 + 현재 이전 구간을 모두 '바쁜 구간'으로 보고
+       시작 시각 기준 정렬 후 한 번 스윕하여 병합한다.
+    3) 병합된 바쁜 구간 사이의 틈(gap) 중 duration 이상인 것이 빈 시간대.
+    4) 틈 안에서 step 단위 후보 시작 시각을 만들고 로컬 점수로 정렬한다.
+
+    바쁜 구간이 vectorize_threshold 이상이면 NumPy 벡터 연산을 사용한다(멀티 주 범위).
+    """
+
+    def __init__(
+        self,
+        day_start: str = "09:00",
+        day_end: str = "21:00",
+        event_minutes: int = 60,
+        step_minutes: int = 30,
+        preferred: Sequence[Tuple[str, str]] = (("10:00", "12:00"), ("14:00", "17:00")),
+        vectorize_threshold: int = 256,
+    ):
+        self.day_start = _hm_to_min(day_start)
+        self.day_end = _hm_to_min(day_end)
+        self.event_minutes = event_minutes
+        self.step = step_minutes
+        self.preferred = [(_hm_to_min(a), _hm_to_min(b)) for a, b in preferred]
+        self.vectorize_threshold = vectorize_threshold
+
+    # ------------------------------ 바쁜 구간 ------------------------------
+
+    def _busy_intervals(self, rows, start_date: datetime.date, days: int,
+                        now_min: int) -> List[Tuple[int, int]]:
+        busy: List[Tuple[int, int]] = []
+        # 업무시간 외 구간: [d일 day_end, d+1일 day_start]
+        busy.append((0, self.day_start))
+        for d in range(days):
+            busy.append((d * _DAY + self.day_end, (d + 1) * _DAY + self.day_start))
+        # 현재 이전은 제안하지 않음
+        if now_min > 0:
+            busy.append((0, now_min))
+
+        for row in rows:
+            if not row.time:
+                continue  # 시간 미정 일정은 바쁜 구간으로 보지 않음
+            d = (datetime.date.fromisoformat(row.date) - start_date).days
+            if d < 0 or d >= days:
+                continue
+            s = d * _DAY + _hm_to_min(row.time)
+            busy.append((s, s + self.event_minutes))
+        return busy
+
+    # ------------------------------ 스윕 ------------------------------
+
+    def _gaps_py(self, busy: List[Tuple[int, int]], horizon: int, duration: int):
+        busy.sort()
+        gaps = []
+        cur_end = busy[0][1] if busy else 0
+        for s, e in busy[1:]:
+            if s > cur_end:
+                if s - cur_end >= duration:
+                    gaps.append((cur_end, s))
+                cur_end = e
+            elif e > cur_end:
+                cur_end = e
+        if horizon - cur_end >= duration:
+            gaps.append((cur_end, horizon))
+        return gaps
+
+    def _gaps_np(self, busy: List[Tuple[int, int]], horizon: int, duration: int):
+        arr = np.asarray(busy, dtype=np.int64)
+        arr = arr[np.argsort(arr[:, 0], kind="stable")]
+        starts = arr[:, 0]
+        ends = np.maximum.accumulate(arr[:, 1])
+        # 다음 구간의 시작이 지금까지의 최대 끝보다 크면 그 사이가 틈
+        gap_start = ends
+        gap_end = np.append(starts[1:], horizon)
+        mask = (gap_end - gap_start) >= duration
+        return list(zip(gap_start[mask].tolist(), gap_end[mask].tolist()))
+
+    # ------------------------------ 점수 ------------------------------
+
+    def _score(self, start: int, gap_start: int, gap_end: int, duration: int) -> float:
+        day, tod = divmod(start, _DAY)
+        score = -10.0 * day  # 가까운 날짜 우선
+        for a, b in self.preferred:
+            if a <= tod and tod + duration <= b:
+                score += 20.0
+                break
+        # 앞뒤 여유(최대 60분)가 있을수록 가산
+        slack = min(start - gap_start, gap_end - (start + duration), 60)
+        score += slack / 6.0
+        return score
+
+    def _candidates_py(self, gaps, duration: int):
+        out = []
+        for gs, ge in gaps:
+            t = -(-gs // self.step) * self.step
+            while t + duration <= ge:
+                out.append((self._score(t, gs, ge, duration), t))
+                t += self.step
+        return out
+
+    def _candidates_np(self, gaps, duration: int):
+        g = np.asarray(gaps, dtype=np.int64)
+        gs, ge = g[:, 0], g[:, 1]
+        first = -(-gs // self.step) * self.step
+        counts = np.maximum((ge - duration - first) // self.step + 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return []
+        idx = np.repeat(np.arange(len(g)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = first[idx] + offsets * self.step
+        gs_i, ge_i = gs[idx], ge[idx]
+
+        day, tod = np.divmod(t, _DAY)
+        score = -10.0 * day
+        pref = np.zeros(total, dtype=bool)
+        for a, b in self.preferred:
+            pref |= (tod >= a) & (tod + duration <= b)
+        score = score + np.where(pref, 20.0, 0.0)
+        slack = np.minimum(np.minimum(t - gs_i, ge_i - (t + duration)), 60)
+        score = score + slack / 6.0
+        return list(zip(score.tolist(), t.tolist()))
+
+    # ------------------------------ 공개 API ------------------------------
+
+    def find(self, rows, start_date: datetime.date, days: int, duration: int,
+             limit: int = 3, now: Optional[datetime.datetime] = None) -> List[Tuple[str, str]]:
+        """
+        rows: [ScheduleRow, ...]
+        Returns: [(YYYY-MM-DD, HH:MM), ...] 점수순, 날짜당 최대 1개
+        """
+        now = now or datetime.datetime.now(tz=KST)
+        now_min = 0
+        if now.date() == start_date:
+            now_min = now.hour * 60 + now.minute
+        horizon = days * _DAY
+
+        busy = self._busy_intervals(rows, start_date, days, now_min)
+        use_np = len(busy) >= self.vectorize_threshold and _numpy() is not None
+        if use_np:
+            gaps = self._gaps_np(busy, horizon, duration)
+            cands = self._candidates_np(gaps, duration) if gaps else []
+        else:
+            gaps = self._gaps_py(busy, horizon, duration)
+            cands = self._candidates_py(gaps, duration)
+
+        cands.sort(key=lambda c: (-c[0], c[1]))
+        picked, seen_days = [], set()
+        for _score, t in cands:
+            day, tod = divmod(int(t), _DAY)
+            if day in seen_days:
+                continue
+            seen_days.add(day)
+            date = start_date + datetime.timedelta(days=day)
+            picked.append((date.strftime("%Y-%m-%d"), f"{tod // 60:02d}:{tod % 60:02d}"))
+            if len(picked) >= limit:
+                break
+        return picked
+
+
+class SuggestionService:
+    """
+    /suggest 엔진: 사용자 일정 → 빈 시간대 → Suggestion 목록
+    """
+
+    def __init__(self, repo, finder: Optional[FreeSlotFinder] = None,
+                 days: int = 14, limit: int = 3):
+        self.repo = repo
+        self.finder = finder or FreeSlotFinder()
+        self.days = days
+        self.limit = limit
+
+    def suggest(self, user_id: int, title: str, duration: int = 60,
+                now: Optional[datetime.datetime] = None) -> List["Suggestion"]:
+        from app.domain.suggestion import Suggestion
+
+        now = now or datetime.datetime.now(tz=KST)
+        start = now.date()
+        end = start + datetime.timedelta(days=self.days - 1)
+        rows = self.repo.list_between(
+            user_id, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+        )
+        slots = self.finder.find(rows, start, self.days, duration, limit=self.limit, now=now)
+        return [
+            Suggestion(
+                title=title,
+                description=f"{duration}분",
+                suggested_date=d,
+                suggested_time=t,
+            )
+            for d, t in slots
+        ]
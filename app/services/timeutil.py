@@ -1,16 +1,77 @@
 """
 한국 시간대(KST) 및 상대 날짜 유틸리티
+
+- 시간대는 표준 라이브러리 zoneinfo (pytz localize 불필요)
+- YYYY-MM-DD / HH:MM 은 strptime 대신 직접 파싱 (strptime 은 호출마다 전역 락 + 포맷 해석)
+  정형 문자열이 아니면 strptime 으로 넘겨 기존과 같은 입력을 허용
+- 발송 시각 등 epoch 계산은 고정 +9시간 산술 (한국은 1988년 이후 서머타임 없음)
 """
 import re
-import pytz
-from datetime import datetime, timedelta, date
-from typing import Union, Optional
+from datetime import datetime, timedelta, date, timezone
+from functools import lru_cache
+from typing import Union, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo("Asia/Seoul")
+_KST_OFFSET_SEC = 9 * 3600
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def parse_ymd(s: str) -> date:
+    """'YYYY-MM-DD' → date (잘못된 값이면 ValueError)"""
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        y, m, d = s[:4], s[5:7], s[8:]
+        if y.isdigit() and m.isdigit() and d.isdigit():
+            return date(int(y), int(m), int(d))
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def parse_hm(s: str) -> Tuple[int, int]:
+    """'HH:MM' → (시, 분) (잘못된 값이면 ValueError)"""
+    if len(s) == 5 and s[2] == ":":
+        h, m = s[:2], s[3:]
+        if h.isdigit() and m.isdigit():
+            hh, mm = int(h), int(m)
+            if hh < 24 and mm < 60:
+                return hh, mm
+            raise ValueError(f"잘못된 시간: {s}")
+    t = datetime.strptime(s, "%H:%M")
+    return t.hour, t.minute
+
+
+def is_valid_ymd(s: Optional[str]) -> bool:
+    if not s:
+        return False
+    try:
+        parse_ymd(s)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def is_valid_hm(s: Optional[str]) -> bool:
+    if not s:
+        return False
+    try:
+        parse_hm(s)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def kst_epoch(date_str: str, time_str: Optional[str] = None, offset_minutes: int = 0,
+              default_hm: Tuple[int, int] = (9, 0)) -> int:
+    """KST 날짜/시간(없으면 default_hm) - offset_minutes → epoch seconds (datetime 객체 생성 없음)"""
+    hh, mm = parse_hm(time_str) if time_str else default_hm
+    days = parse_ymd(date_str).toordinal() - _EPOCH_ORDINAL
+    return days * 86400 + hh * 3600 + mm * 60 - _KST_OFFSET_SEC - offset_minutes * 60
 
 
 class KSTTimeUtil:
     """한국 시간대(KST) 유틸리티"""
 
-    KST = pytz.timezone('Asia/Seoul')
+    KST = KST
 
     @classmethod
     def now(cls) -> datetime:
@@ -24,17 +85,17 @@ class KSTTimeUtil:
 
     @classmethod
     def to_kst(cls, dt: datetime) -> datetime:
-        """datetime을 KST로 변환"""
+        """datetime을 KST로 변환 (naive 는 UTC 로 간주)"""
         if dt.tzinfo is None:
-            dt = pytz.UTC.localize(dt)
+            dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(cls.KST)
 
     @classmethod
     def from_kst(cls, dt: datetime) -> datetime:
-        """KST datetime을 UTC로 변환"""
+        """KST datetime을 UTC로 변환 (naive 는 KST 로 간주)"""
         if dt.tzinfo is None:
-            dt = cls.KST.localize(dt)
-        return dt.astimezone(pytz.UTC)
+            dt = dt.replace(tzinfo=cls.KST)
+        return dt.astimezone(timezone.utc)
 
     @classmethod
     def format_datetime(cls, dt: datetime, format_str: str = "%Y-%m-%d %H:%M") -> str:
@@ -53,10 +114,10 @@ class KSTTimeUtil:
     def parse_datetime(cls, date_str: str, time_str: str = "00:00") -> datetime:
         """날짜와 시간 문자열을 KST datetime으로 파싱"""
         try:
-            dt_str = f"{date_str} {time_str}"
-            dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-            return cls.KST.localize(dt)
-        except ValueError:
+            d = parse_ymd(date_str)
+            hh, mm = parse_hm(time_str)
+            return datetime(d.year, d.month, d.day, hh, mm, tzinfo=cls.KST)
+        except (ValueError, TypeError):
             raise ValueError(f"잘못된 날짜/시간 형식: {date_str} {time_str}")
 
 
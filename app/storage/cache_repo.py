@@ -0,0 +1,82 @@
+import time
+from typing import Any, Callable, Optional, Tuple
+
+
+class SQLiteCacheBackend:
+    """
+    suggestion_cache 테이블 기반 공유 캐시 (여러 봇 프로세스가 같은 DB 파일을 볼 때)
+
+    - 키: (chat_id, msg_id), 값: dumps(payload) 문자열
+    - get 시 accessed_at 갱신 → 스윕 때 max_entries 초과분을 accessed_at 오래된 순으로 삭제 (LRU)
+    - put 경로에서는 개수 제한을 검사하지 않음 (쓰기 한 번으로 유지, 초과분은 스윕에서 정리)
+    """
+
+    def __init__(self, db, max_entries: int = 4096,
+                 dumps: Callable[[Any], str] = str, loads: Callable[[str], Any] = str):
+        self.db = db
+        self.max_entries = max_entries
+        self.dumps = dumps
+        self.loads = loads
+
+    def __len__(self) -> int:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM suggestion_cache")
+            return cur.fetchone()[0]
+
+    def get(self, key: Tuple[int, int], now: float) -> Tuple[Optional[Any], bool]:
+        chat_id, msg_id = key
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT expires_at, payload FROM suggestion_cache WHERE chat_id=? AND msg_id=?",
+                (chat_id, msg_id),
+            )
+            row = cur.fetchone()
+            if row is None:
+                return None, False
+            expires_at, raw = row
+            if expires_at <= now:
+                cur.execute(
+                    "DELETE FROM suggestion_cache WHERE chat_id=? AND msg_id=?", (chat_id, msg_id)
+                )
+                conn.commit()
+                return None, True
+            cur.execute(
+                "UPDATE suggestion_cache SET accessed_at=? WHERE chat_id=? AND msg_id=?",
+                (now, chat_id, msg_id),
+            )
+            conn.commit()
+        return self.loads(raw), False
+
+    def put(self, key: Tuple[int, int], expires_at: float, payload: Any) -> int:
+        chat_id, msg_id = key
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR REPLACE INTO suggestion_cache(chat_id, msg_id, expires_at, accessed_at, payload) "
+                "VALUES(?,?,?,?,?)",
+                (chat_id, msg_id, expires_at, time.time(), self.dumps(payload)),
+            )
+            conn.commit()
+        return 0
+
+    def delete(self, key: Tuple[int, int]):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM suggestion_cache WHERE chat_id=? AND msg_id=?", key)
+            conn.commit()
+
+    def sweep(self, now: float) -> Tuple[int, int]:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM suggestion_cache WHERE expires_at<=?", (now,))
+            expired = cur.rowcount
+            cur.execute("""
+            DELETE FROM suggestion_cache WHERE rowid IN (
+                SELECT rowid FROM suggestion_cache
+                 ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)
+            """, (self.max_entries,))
+            evicted = cur.rowcount
+            conn.commit()
+        return expired, evicted
@@ -1,16 +1,38 @@
 # app/storage/db.py
+import logging
 import sqlite3
 from pathlib import Path
 
+from app.storage.profiler import QueryProfiler, connection_factory
+
+log = logging.getLogger(__name__)
+
+# 스키마(테이블/인덱스/컬럼)를 바꾸면 1 올릴 것: PRAGMA user_version 이 같으면 기동 시 DDL 을 건너뜀
+SCHEMA_VERSION = 4
+
 class DB:
-    def __init__(self, path: str):
+    def __init__(self, path: str, profiler: QueryProfiler = None):
         self.path = str(Path(path))
+        self.profiler = profiler
+        self._factory = connection_factory(profiler) if profiler is not None else sqlite3.Connection
         Path(self.path).parent.mkdir(parents=True, exist_ok=True)
         self._init()
 
+    def connect(self) -> sqlite3.Connection:
+        """모든 저장소가 쓰는 연결 (profiler가 있으면 문장별 시간 집계)"""
+        return sqlite3.connect(self.path, factory=self._factory)
+
     def _init(self):
-        with sqlite3.connect(self.path) as conn:
+        with self.connect() as conn:
             cur = conn.cursor()
+            cur.execute("PRAGMA user_version")
+            if cur.fetchone()[0] >= SCHEMA_VERSION:
+                return
+            # 새 DB 파일이면 테이블 생성 전에 설정해야 적용됨 (기존 파일은 아래에서 VACUUM 으로 전환)
+            cur.execute("PRAGMA auto_vacuum")
+            incremental = cur.fetchone()[0] == 2
+            if not incremental:
+                cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
             cur.execute("""
             CREATE TABLE IF NOT EXISTS schedules(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -30,4 +52,141 @@ class DB:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             """)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS digest_subscriptions(
+                user_id INTEGER NOT NULL,
+                hm TEXT NOT NULL,  -- HH:MM (KST)
+                PRIMARY KEY(user_id, hm)
+            )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_digest_hm ON digest_subscriptions(hm, user_id)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_schedules_date_user ON schedules(date, user_id, time)")
+            # 사용자별 목록(/list, /today): user_id 선두 인덱스가 없으면 schedules 전체 스캔
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_schedules_user_date ON schedules(user_id, date, time)")
+            # 다중 워커 알림 샤딩: 샤드별 임대(lease)와 발송 선점(claim)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS reminder_leases(
+                shard INTEGER PRIMARY KEY,
+                owner TEXT,
+                expires_at REAL NOT NULL DEFAULT 0  -- epoch seconds
+            )
+            """)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS reminder_workers(
+                worker_id TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL  -- 하트비트 만료 (epoch seconds)
+            )
+            """)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS dispatch_claims(
+                key TEXT PRIMARY KEY,  -- 'r:<reminder_id>' / 'digest:<HH:MM>:<YYYY-MM-DD>'
+                worker_id TEXT NOT NULL,
+                claimed_at REAL NOT NULL
+            )
+            """)
+            # /suggest 결과 공유 캐시 (SUGGESTION_CACHE_BACKEND=sqlite)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS suggestion_cache(
+                chat_id INTEGER NOT NULL,
+                msg_id INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                payload TEXT NOT NULL,  -- JSON
+                PRIMARY KEY(chat_id, msg_id)
+            )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_suggestion_cache_exp ON suggestion_cache(expires_at)")
+            # 보관 기간이 지난 일정 (MaintenanceService 가 schedules 에서 옮김, /list 등은 읽지 않음)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS schedules_archive(
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER,
+                title TEXT,
+                description TEXT,
+                date TEXT,
+                time TEXT,
+                archived_at REAL NOT NULL
+            )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_schedules_archive_user ON schedules_archive(user_id, date)")
+
+            # 사용자별 데이터 버전 (쓰기 트랜잭션에서 증가, 목록 화면 캐시 키)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS user_versions(
+                user_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+            """)
+
+            # 알림 발송 시각(epoch) / 전달 시각: 재시작 후 놓친 알림 보충 발송용
+            _ensure_column(cur, "reminders", "fire_at", "INTEGER")
+            _ensure_column(cur, "reminders", "delivered_at", "REAL")
+            # 기존 행은 일정 날짜/시간(없으면 09:00, KST)에서 계산해 채움
+            cur.execute("""
+            UPDATE reminders
+               SET fire_at = (
+                   SELECT CAST(strftime('%s', s.date || ' ' || COALESCE(s.time, '09:00')) AS INTEGER)
+                          - 9 * 3600 - reminders.offset_minutes * 60
+                     FROM schedules s WHERE s.id = reminders.schedule_id)
+             WHERE fire_at IS NULL
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders(delivered_at, fire_at)")
+            _create_fts(cur)
+            cur.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
             conn.commit()
+            # 기존 파일을 incremental 로 전환 (한 번만, 트랜잭션 밖에서 파일 전체 재작성)
+            if not incremental:
+                cur.execute("VACUUM")
+
+
+def _ensure_column(cur, table: str, column: str, decl: str):
+    cur.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cur.fetchall()}:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _create_fts(cur):
+    """
+    /search 용 FTS5 색인 (schedules 를 원본으로 쓰는 external content 테이블)
+    - trigram 토크나이저: 띄어쓰기/조사와 무관하게 3글자 이상 부분 문자열 검색 (한국어)
+    - owner 열('u<user_id>u'): MATCH 안에서 사용자 범위를 좁힘 → 다른 사용자의 일치 행을 조인/정렬하지 않음
+      (숫자 사이에 u 가 없으므로 'u7u' 는 'u17u' 등의 부분 문자열이 될 수 없음)
+    - schedules 변경은 트리거로 동기화, 보관(archive)으로 지워진 일정은 색인에서도 빠짐
+    - FTS5 가 없는 SQLite 빌드면 건너뜀 (ScheduleRepo.search 가 LIKE 로 대체)
+    """
+    cur.execute("""
+    CREATE VIEW IF NOT EXISTS schedules_fts_src AS
+    SELECT id, title, description, 'u' || user_id || 'u' AS owner FROM schedules
+    """)
+    try:
+        cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS schedules_fts USING fts5(
+            title, description, owner,
+            content='schedules_fts_src', content_rowid='id', tokenize='trigram'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        log.warning("FTS5 사용 불가, /search 는 LIKE 검색으로 동작: %s", e)
+        return
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS schedules_fts_ai AFTER INSERT ON schedules BEGIN
+        INSERT INTO schedules_fts(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id || 'u');
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS schedules_fts_ad AFTER DELETE ON schedules BEGIN
+        INSERT INTO schedules_fts(schedules_fts, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id || 'u');
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS schedules_fts_au AFTER UPDATE OF user_id, title, description ON schedules BEGIN
+        INSERT INTO schedules_fts(schedules_fts, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id || 'u');
+        INSERT INTO schedules_fts(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id || 'u');
+    END
+    """)
+    # 기존 일정 색인 (스키마 올릴 때 한 번)
+    cur.execute("INSERT INTO schedules_fts(schedules_fts) VALUES ('rebuild')")
@@ -0,0 +1,109 @@
+import time
+
+
+class LeaseRepo:
+    """
+    reminder_leases / reminder_workers / dispatch_claims 접근
+
+    - 샤드 임대는 조건부 UPDATE 한 문장으로 선점 (만료됐거나 주인이 없는 샤드만)
+    - 발송 선점은 INSERT OR IGNORE: 처음 넣은 워커만 rowcount == 1 → 최대 1회 발송 보장
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def ensure_shards(self, shard_count: int):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.executemany(
+                "INSERT OR IGNORE INTO reminder_leases(shard, owner, expires_at) VALUES(?, NULL, 0)",
+                [(i,) for i in range(shard_count)],
+            )
+            conn.commit()
+
+    def renew(self, owner: str, ttl: float):
+        """하트비트 + 내 임대 연장 후 현재 보유 샤드 목록 반환"""
+        now = time.time()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR REPLACE INTO reminder_workers(worker_id, expires_at) VALUES(?,?)",
+                (owner, now + ttl),
+            )
+            cur.execute("DELETE FROM reminder_workers WHERE expires_at<=?", (now,))
+            cur.execute(
+                "UPDATE reminder_leases SET expires_at=? WHERE owner=? AND expires_at>?",
+                (now + ttl, owner, now),
+            )
+            conn.commit()
+            cur.execute("SELECT shard FROM reminder_leases WHERE owner=? AND expires_at>?", (owner, now))
+            return [row[0] for row in cur.fetchall()]
+
+    def live_workers(self):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT worker_id FROM reminder_workers WHERE expires_at>?",
+                (time.time(),),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    def free_shards(self):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT shard FROM reminder_leases WHERE owner IS NULL OR expires_at<=? ORDER BY shard",
+                (time.time(),),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    def try_claim_shard(self, shard: int, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE reminder_leases SET owner=?, expires_at=? "
+                "WHERE shard=? AND (owner IS NULL OR expires_at<=?)",
+                (owner, now + ttl, shard, now),
+            )
+            conn.commit()
+            return cur.rowcount == 1
+
+    def release_claims(self, keys, owner: str):
+        """선점 취소 (전송이 버려진 경우 → 보충 발송/다른 워커가 다시 선점할 수 있게)"""
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.executemany(
+                "DELETE FROM dispatch_claims WHERE key=? AND worker_id=?",
+                [(key, owner) for key in keys],
+            )
+            conn.commit()
+
+    def release_shard(self, shard: int, owner: str):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE reminder_leases SET owner=NULL, expires_at=0 WHERE shard=? AND owner=?",
+                (shard, owner),
+            )
+            conn.commit()
+
+    def claim(self, key: str, owner: str) -> bool:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR IGNORE INTO dispatch_claims(key, worker_id, claimed_at) VALUES(?,?,?)",
+                (key, owner, time.time()),
+            )
+            conn.commit()
+            return cur.rowcount == 1
+
+    def release_claims(self, keys, owner: str):
+        """선점 취소 (전송이 버려진 경우 → 보충 발송/다른 워커가 다시 선점할 수 있게)"""
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.executemany(
+                "DELETE FROM dispatch_claims WHERE key=? AND worker_id=?",
+                [(key, owner) for key in keys],
+            )
+            conn.commit()
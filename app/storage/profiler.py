@@ -0,0 +1,138 @@
+import itertools
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+log = logging.getLogger(__name__)
+
+# IN (?,?,?) 처럼 길이가 바뀌는 자리표시자 목록은 하나로 묶어 같은 문장으로 집계
+_PLACEHOLDERS = re.compile(r"\?(\s*,\s*\?)+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(sql: str) -> str:
+    return _PLACEHOLDERS.sub("?,…", _SPACES.sub(" ", sql).strip())
+
+
+class QueryProfiler:
+    """
+    SQL 문장별 실행 횟수/누적·최대 시간 집계 + 느린 쿼리 로그
+
+    - execute 부터 fetch 까지(SQLite 는 fetch 때 나머지 행을 계산) 를 한 번의 실행 시간으로 봄
+    - slow_ms 이상 걸린 문장은 경고 로그 + EXPLAIN QUERY PLAN (문장당 처음 한 번만)
+    - 파라미터 값은 로그에 남기지 않음 (사용자 데이터)
+    """
+
+    def __init__(self, slow_ms: float = 50.0):
+        self.slow_sec = slow_ms / 1000.0
+        self._stats: Dict[str, List[float]] = {}  # sql → [횟수, 누적초, 최대초]
+        self._explained = set()
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, sql: str, elapsed: float, count: int = 1):
+        with self._lock:
+            row = self._stats.get(sql)
+            if row is None:
+                row = self._stats[sql] = [0, 0.0, 0.0]
+            row[0] += count
+            row[1] += elapsed
+            if elapsed > row[2]:
+                row[2] = elapsed
+
+    def slow(self, conn: sqlite3.Connection, sql: str, raw_sql: str, params, elapsed: float):
+        plan = ""
+        with self._lock:
+            first = sql not in self._explained
+            self._explained.add(sql)
+        if first and raw_sql.lstrip()[:6].upper() in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+            try:
+                cur = sqlite3.Cursor(conn)  # 프로파일링되지 않는 기본 커서
+                cur.execute("EXPLAIN QUERY PLAN " + raw_sql, params)
+                plan = "\n".join(f"  {row[-1]}" for row in cur.fetchall())
+            except sqlite3.Error as e:
+                plan = f"  (EXPLAIN 실패: {e})"
+        log.warning("slow query %.1f ms: %s%s", elapsed * 1e3, sql, "\n" + plan if plan else "")
+
+    def top(self, n: int = 10) -> List[Tuple[str, int, float, float]]:
+        """누적 시간 순 상위 n개: (sql, 횟수, 누적초, 최대초)"""
+        with self._lock:
+            items = [(sql, int(c), t, m) for sql, (c, t, m) in self._stats.items()]
+        items.sort(key=lambda r: r[2], reverse=True)
+        return items[:n]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._explained.clear()
+            self.started_at = time.time()
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    profiler: QueryProfiler = None
+
+    def _start(self, raw_sql: str, params, count: int, fn):
+        self._sql = normalize(raw_sql)
+        self._raw = raw_sql
+        self._params = params
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self._elapsed = time.perf_counter() - t0
+            self._logged = False
+            self.profiler.record(self._sql, self._elapsed, count)
+            self._check()
+
+    def _check(self):
+        if not self._logged and self._elapsed >= self.profiler.slow_sec:
+            self._logged = True
+            params = self._params if isinstance(self._params, (tuple, list, dict)) else ()
+            self.profiler.slow(self.connection, self._sql, self._raw, params, self._elapsed)
+
+    def _fetch(self, fn):
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            if getattr(self, "_sql", None) is not None:
+                dt = time.perf_counter() - t0
+                self._elapsed += dt
+                self.profiler.record(self._sql, dt, count=0)
+                self._check()
+
+    def execute(self, sql, parameters=()):
+        return self._start(sql, parameters, 1, lambda: super(ProfilingCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        # EXPLAIN 에는 첫 행 파라미터를 씀 (제너레이터도 끝까지 펼치지 않고 첫 행만 꺼내 다시 이어 붙임)
+        it = iter(seq_of_parameters)
+        first = next(it, None)
+        if first is None:
+            first, rows = (), ()
+        else:
+            rows = itertools.chain((first,), it)
+        return self._start(sql, first, 1, lambda: super(ProfilingCursor, self).executemany(sql, rows))
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(lambda: super(ProfilingCursor, self).fetchmany(size or self.arraysize))
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+
+def connection_factory(profiler: QueryProfiler):
+    """sqlite3.connect(factory=...) 용: cursor()가 ProfilingCursor를 돌려주는 Connection"""
+    cursor_cls = type("ProfilingCursor", (ProfilingCursor,), {"profiler": profiler})
+
+    class ProfilingConnection(sqlite3.Connection):
+        def cursor(self, factory=cursor_cls):
+            return super().cursor(factory)
+
+    return ProfilingConnection
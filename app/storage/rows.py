@@ -0,0 +1,53 @@
+# app/storage/rows.py
+"""
+조회 결과 행 타입 (읽기 경로 전용)
+
+- NamedTuple: __slots__ = () 인 tuple 하위 클래스 → 인스턴스 __dict__ 없음, 필드 접근은 인덱스 디스크립터
+  기존 튜플 언패킹(sid, title, ... = row)도 그대로 동작
+- row_factory 는 tuple.__new__ 로 sqlite3 가 만든 튜플을 그대로 감싸기만 함 (검증/변환 없음)
+  그래도 행마다 함수 호출 + 객체 생성이 더해져 기본 튜플보다 느림 (benchmarks/rows.py)
+  → 핸들러가 읽는 화면용 조회에만 사용, 대량 경로(list_pending_reminders, 다이제스트 발송)는 기본 튜플
+- pydantic 모델(Schedule 등)은 사용자 입력/LLM 응답 같은 입력 경계에서만 사용
+"""
+from typing import NamedTuple, Optional
+
+_new = tuple.__new__
+
+
+class ScheduleRow(NamedTuple):
+    id: int
+    title: str
+    description: str
+    date: str            # YYYY-MM-DD
+    time: Optional[str]  # HH:MM or None
+
+
+class ReminderRow(NamedTuple):
+    """알림 + 일정 조인 행"""
+    id: int
+    schedule_id: int
+    offset_minutes: int
+    title: str
+    description: str
+    date: str
+    time: Optional[str]
+
+
+class DaySummary(NamedTuple):
+    """기간 보기(/week, /month)의 날짜별 집계"""
+    date: str
+    count: int
+    first_time: Optional[str]  # 가장 이른 일정 시간 (모두 시간 미정이면 None)
+    first_title: str
+
+
+def schedule_row(cursor, row) -> ScheduleRow:
+    return _new(ScheduleRow, row)
+
+
+def reminder_row(cursor, row) -> ReminderRow:
+    return _new(ReminderRow, row)
+
+
+def day_summary_row(cursor, row) -> DaySummary:
+    return _new(DaySummary, row)
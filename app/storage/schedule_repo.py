@@ -1,76 +1,214 @@
-import sqlite3
+import time
 
+from app.services.metrics import DB_SECONDS, instrument_methods
+from app.storage.rows import day_summary_row, reminder_row, schedule_row
+
+@instrument_methods(DB_SECONDS)
 class ScheduleRepo:
     def __init__(self, db):
         self.db = db
+        self._fts = None  # schedules_fts 존재 여부 (첫 검색 때 확인)
+
+    # 사용자별 데이터 버전 (목록 화면 캐시 무효화용)
+    # user_versions 에 저장하고 쓰기와 같은 트랜잭션에서 증가 → 워커/프로세스가 달라도 같은 값
+    def version(self, user_id) -> int:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT version FROM user_versions WHERE user_id=?", (user_id,))
+            row = cur.fetchone()
+            return row[0] if row else 0
+
+    @staticmethod
+    def _bump(cur, *user_ids):
+        cur.executemany(
+            "INSERT INTO user_versions(user_id, version) VALUES(?, 1) "
+            "ON CONFLICT(user_id) DO UPDATE SET version = version + 1",
+            [(u,) for u in set(user_ids)],
+        )
 
     def add(self, user_id, title, desc, date, time):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
             cur.execute(
                 "INSERT INTO schedules(user_id,title,description,date,time) VALUES(?,?,?,?,?)",
                 (user_id, title, desc, date, time),
             )
+            self._bump(cur, user_id)
             conn.commit()
             return cur.lastrowid
 
     def get(self, user_id, sid):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
+            cur.row_factory = schedule_row
             cur.execute(
                 "SELECT id,title,description,date,time FROM schedules WHERE user_id=? AND id=?",
                 (user_id, sid),
             )
             return cur.fetchone()
 
-    def list_all(self, user_id):
-        with sqlite3.connect(self.db.path) as conn:
+    # 보관(archive)되지 않은 일정만, limit 이 음수면 전체
+    def list_all(self, user_id, limit: int = -1):
+        with self.db.connect() as conn:
             cur = conn.cursor()
+            cur.row_factory = schedule_row
             cur.execute(
-                "SELECT id,title,description,date,time FROM schedules WHERE user_id=? ORDER BY date,time",
-                (user_id,),
+                "SELECT id,title,description,date,time FROM schedules WHERE user_id=? ORDER BY date,time LIMIT ?",
+                (user_id, limit),
             )
             return cur.fetchall()
 
     def today(self, user_id, today_str):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
+            cur.row_factory = schedule_row
             cur.execute(
                 "SELECT id,title,description,date,time FROM schedules WHERE user_id=? AND date=? ORDER BY time",
                 (user_id, today_str),
             )
             return cur.fetchall()
 
+    def list_between(self, user_id, start_date, end_date):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.row_factory = schedule_row
+            cur.execute(
+                "SELECT id,title,description,date,time FROM schedules "
+                "WHERE user_id=? AND date BETWEEN ? AND ? ORDER BY date,time",
+                (user_id, start_date, end_date),
+            )
+            return cur.fetchall()
+
+    # 기간 내 날짜별 일정 수 + 가장 이른 일정 (idx_schedules_user_date 범위 스캔 + GROUP BY 한 번)
+    # MIN() 하나만 쓰는 집계에서 SQLite 는 title 을 MIN 을 준 행에서 가져옴 (시간 미정은 '24:00' 으로 맨 뒤)
+    # 반환: [DaySummary] 날짜 순, 일정 없는 날은 빠짐
+    def day_summary(self, user_id, start_date, end_date):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.row_factory = day_summary_row
+            cur.execute(
+                "SELECT date, COUNT(*), NULLIF(MIN(COALESCE(time, '24:00')), '24:00'), title FROM schedules "
+                "WHERE user_id=? AND date BETWEEN ? AND ? GROUP BY date ORDER BY date",
+                (user_id, start_date, end_date),
+            )
+            return cur.fetchall()
+
+    # 제목/설명 검색 (보관되지 않은 일정만)
+    # - 3글자 이상 단어: FTS5 trigram 색인 MATCH (owner 열로 사용자 한정)
+    # - 2글자 이하 단어: trigram 으로 찾을 수 없어 사용자 일정 범위 안에서 LIKE
+    # - 순위: 제목에 들어 있는 단어 수 → 최근 날짜 순
+    #   (bm25 는 단어마다 전체 문서 빈도를 세느라 전체 일치 건수에 비례해 느려짐)
+    # - start_date/end_date: YYYY-MM-DD (포함)
+    def search(self, user_id, terms, start_date=None, end_date=None, limit: int = 5, offset: int = 0):
+        fts_terms = [t for t in terms if len(t) >= 3]
+        like_terms = [t for t in terms if len(t) < 3]
+        if fts_terms and not self._has_fts():
+            fts_terms, like_terms = [], list(terms)
+
+        where, params = ["s.user_id = ?"], [user_id]
+        if start_date:
+            where.append("s.date >= ?")
+            params.append(start_date)
+        if end_date:
+            where.append("s.date <= ?")
+            params.append(end_date)
+        for t in like_terms:
+            pat = "%" + t.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(s.title LIKE ? ESCAPE '\\' OR s.description LIKE ? ESCAPE '\\')")
+            params += [pat, pat]
+        order = "s.date DESC, s.time DESC, s.id DESC"
+        if terms:
+            order = " + ".join("(instr(s.title, ?) > 0)" for _ in terms) + " DESC, " + order
+            params += list(terms)
+
+        cols = "s.id, s.title, s.description, s.date, s.time"
+        if fts_terms:
+            match = f'owner:"u{int(user_id)}u" AND ' + " AND ".join(
+                '{title description}:"' + t.replace('"', '""') + '"' for t in fts_terms
+            )
+            sql = (
+                f"SELECT {cols} FROM schedules_fts JOIN schedules s ON s.id = schedules_fts.rowid "
+                f"WHERE schedules_fts MATCH ? AND {' AND '.join(where)} ORDER BY {order} LIMIT ? OFFSET ?"
+            )
+            params = [match] + params
+        else:
+            sql = f"SELECT {cols} FROM schedules s WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ? OFFSET ?"
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.row_factory = schedule_row
+            cur.execute(sql, params + [limit, offset])
+            return cur.fetchall()
+
+    def _has_fts(self) -> bool:
+        if self._fts is None:
+            with self.db.connect() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT 1 FROM sqlite_master WHERE name='schedules_fts'")
+                self._fts = cur.fetchone() is not None
+        return self._fts
+
     def delete(self, user_id, sid):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM schedules WHERE id=? AND user_id=?", (sid, user_id))
+            # _bump(executemany) 가 rowcount 를 덮어쓰므로 먼저 읽어 둠
+            deleted = cur.rowcount > 0
+            if deleted:
+                self._bump(cur, user_id)
             conn.commit()
-            return cur.rowcount > 0
+            return deleted
 
+    # user_versions 행은 남김 (지우면 버전이 0 으로 돌아가 예전 캐시와 겹칠 수 있음)
     def delete_all(self, user_id):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
             # 리마인더 먼저 지우기
             cur.execute("DELETE FROM reminders WHERE user_id=?", (user_id,))
             cur.execute("DELETE FROM schedules WHERE user_id=?", (user_id,))
             cnt = cur.rowcount
+            cur.execute("DELETE FROM schedules_archive WHERE user_id=?", (user_id,))
+            cur.execute("DELETE FROM digest_subscriptions WHERE user_id=?", (user_id,))
+            self._bump(cur, user_id)
             conn.commit()
             return cnt
 
     # ---- reminders ----
-    def add_reminder(self, user_id, schedule_id, offset_minutes: int):
-        with sqlite3.connect(self.db.path) as conn:
+    def add_reminder(self, user_id, schedule_id, offset_minutes: int, fire_at: int = None):
+        with self.db.connect() as conn:
             cur = conn.cursor()
             cur.execute(
-                "INSERT INTO reminders(user_id, schedule_id, offset_minutes) VALUES(?,?,?)",
-                (user_id, schedule_id, offset_minutes),
+                "INSERT INTO reminders(user_id, schedule_id, offset_minutes, fire_at) VALUES(?,?,?,?)",
+                (user_id, schedule_id, offset_minutes, fire_at),
             )
+            rid = cur.lastrowid
+            self._bump(cur, user_id)
             conn.commit()
-            return cur.lastrowid
+            return rid
+
+    def find_reminder(self, user_id, schedule_id, offset_minutes: int):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT id FROM reminders WHERE user_id=? AND schedule_id=? AND offset_minutes=?",
+                (user_id, schedule_id, offset_minutes),
+            )
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    def list_reminder_ids(self, user_id, schedule_id=None):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            if schedule_id is None:
+                cur.execute("SELECT id FROM reminders WHERE user_id=?", (user_id,))
+            else:
+                cur.execute(
+                    "SELECT id FROM reminders WHERE user_id=? AND schedule_id=?",
+                    (user_id, schedule_id),
+                )
+            return [row[0] for row in cur.fetchall()]
 
     def list_reminders_for_user(self, user_id):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
             cur.execute(
                 "SELECT id, schedule_id, offset_minutes FROM reminders WHERE user_id=?",
@@ -79,26 +217,104 @@ class ScheduleRepo:
             return cur.fetchall()
 
 
+    # 발송 대기 알림 (아직 claim 되지 않은 것)
+    # shards가 주어지면 user_id % shard_count 가 shards 에 속하는 사용자만
+    # 반환: [(reminder_id, user_id, fire_at, offset_minutes, date, time)]
+    # fire_at 은 저장 시 계산된 epoch (NULL 일 때만 호출 측이 date/time 으로 계산)
+    # 발송 시각이 이미 지난 알림은 제외 (놓친 알림은 list_missed_reminders 로 보충)
+    def list_pending_reminders(self, shard_count=None, shards=None, after_id: int = 0,
+                               now: float = None):
+        sql = """
+            SELECT r.id, r.user_id, r.fire_at, r.offset_minutes, s.date, s.time
+              FROM reminders r
+              JOIN schedules s ON s.id = r.schedule_id
+             WHERE r.id > ?
+               AND r.delivered_at IS NULL
+               AND (r.fire_at IS NULL OR r.fire_at > ?)
+               AND NOT EXISTS (SELECT 1 FROM dispatch_claims c WHERE c.key = 'r:' || r.id)
+        """
+        params = [after_id, int(time.time() if now is None else now)]
+        if shards is not None:
+            shards = list(shards)
+            sql += f" AND (r.user_id % ?) IN ({','.join('?' * len(shards))})"
+            params += [shard_count] + shards
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql + " ORDER BY r.id", params)
+            return cur.fetchall()
+
+    # 전달되지 않은 채 [since_ts, until_ts] 사이에 발송 시각이 지난 알림 (재시작 보충 발송)
+    # 반환: [(reminder_id, user_id, title, date, time)] user_id, fire_at 순
+    def list_missed_reminders(self, since_ts: float, until_ts: float, shard_count=None,
+                              shards=None, limit: int = 500):
+        sql = """
+            SELECT r.id, r.user_id, s.title, s.date, s.time
+              FROM reminders r
+              JOIN schedules s ON s.id = r.schedule_id
+             WHERE r.delivered_at IS NULL
+               AND r.fire_at BETWEEN ? AND ?
+               AND NOT EXISTS (SELECT 1 FROM dispatch_claims c WHERE c.key = 'r:' || r.id)
+        """
+        params = [int(since_ts), int(until_ts)]
+        if shards is not None:
+            shards = list(shards)
+            sql += f" AND (r.user_id % ?) IN ({','.join('?' * len(shards))})"
+            params += [shard_count] + shards
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql + " ORDER BY r.user_id, r.fire_at LIMIT ?", params + [limit])
+            return cur.fetchall()
+
+    def mark_reminders_delivered(self, reminder_ids):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.executemany(
+                "UPDATE reminders SET delivered_at=? WHERE id=?",
+                [(time.time(), rid) for rid in reminder_ids],
+            )
+            conn.commit()
+
+    # 알림 단건 조회 (+ 일정 정보 조인)
+    # 반환: ReminderRow or None
+    def get_reminder_detailed(self, user_id: int, reminder_id: int):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.row_factory = reminder_row
+            cur.execute("""
+                SELECT r.id, r.schedule_id, r.offset_minutes,
+                       s.title, s.description, s.date, s.time
+                  FROM reminders r
+                  JOIN schedules s ON s.id = r.schedule_id
+                 WHERE r.id=? AND r.user_id=?
+            """, (reminder_id, user_id))
+            return cur.fetchone()
+
     # 알림 단건 삭제
     def delete_reminder(self, user_id: int, reminder_id: int) -> bool:
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM reminders WHERE id=? AND user_id=?", (reminder_id, user_id))
+            deleted = cur.rowcount > 0
+            if deleted:
+                self._bump(cur, user_id)
             conn.commit()
-            return cur.rowcount > 0
+            return deleted
 
     # 특정 일정의 모든 알림 삭제
     def delete_reminders_for_schedule(self, user_id: int, schedule_id: int):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM reminders WHERE user_id=? AND schedule_id=?", (user_id, schedule_id))
+            if cur.rowcount > 0:
+                self._bump(cur, user_id)
             conn.commit()
 
     # 사용자 전체 알림 목록 (+ 일정 정보 조인)
-    # 반환: [(reminder_id, schedule_id, offset_minutes, title, desc, date, time)]
+    # 반환: [ReminderRow]
     def list_reminders_detailed(self, user_id: int):
-        with sqlite3.connect(self.db.path) as conn:
+        with self.db.connect() as conn:
             cur = conn.cursor()
+            cur.row_factory = reminder_row
             cur.execute("""
                 SELECT r.id, r.schedule_id, r.offset_minutes,
                        s.title, s.description, s.date, s.time
@@ -108,3 +324,97 @@ class ScheduleRepo:
                  ORDER BY s.date ASC, s.time ASC, r.offset_minutes ASC
             """, (user_id,))
             return cur.fetchall()
+
+    # ---- daily digest ----
+    def add_digest_subscription(self, user_id: int, hm: str):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR IGNORE INTO digest_subscriptions(user_id, hm) VALUES(?,?)",
+                (user_id, hm),
+            )
+            conn.commit()
+
+    def list_digest_times(self):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT DISTINCT hm FROM digest_subscriptions")
+            return [row[0] for row in cur.fetchall()]
+
+    # hm 구독자 전원의 date 일정을 한 번의 쿼리로 스트리밍 (user_id 순 정렬)
+    # 반환: (user_id, id, title, description, date, time) 튜플 제너레이터 — 일정 없는 구독자는 id 이하가 NULL
+    # 구독자 전원을 훑는 대량 경로라 row_factory 없이 기본 튜플 그대로
+    def iter_digest_rows(self, hm: str, date: str):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT d.user_id, s.id, s.title, s.description, s.date, s.time
+                  FROM digest_subscriptions d
+                  LEFT JOIN schedules s ON s.date = ? AND s.user_id = d.user_id
+                 WHERE d.hm = ?
+                 ORDER BY d.user_id, s.time
+            """, (date, hm))
+            yield from cur
+
+    # ---- maintenance (보관/정리) ----
+    # date < cutoff_date 인 일정 최대 limit 건을 schedules_archive 로 옮기고 해당 알림 삭제 (한 트랜잭션)
+    # 반환: 옮긴 일정별 user_id 목록 (limit 보다 적으면 더 옮길 것 없음)
+    def archive_batch(self, cutoff_date: str, limit: int):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT id, user_id FROM schedules WHERE date < ? ORDER BY date LIMIT ?",
+                (cutoff_date, limit),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                return []
+            ids = [r[0] for r in rows]
+            marks = ",".join("?" * len(ids))
+            cur.execute(
+                "INSERT OR REPLACE INTO schedules_archive(id,user_id,title,description,date,time,archived_at) "
+                f"SELECT id,user_id,title,description,date,time,? FROM schedules WHERE id IN ({marks})",
+                [time.time()] + ids,
+            )
+            cur.execute(f"DELETE FROM reminders WHERE schedule_id IN ({marks})", ids)
+            cur.execute(f"DELETE FROM schedules WHERE id IN ({marks})", ids)
+            users = [r[1] for r in rows]
+            self._bump(cur, *users)
+            conn.commit()
+        return users
+
+    # 전달된 지 오래된 알림 최대 limit 건 삭제 → 삭제 건수
+    def purge_delivered_reminders(self, before_ts: float, limit: int) -> int:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM reminders WHERE id IN ("
+                " SELECT id FROM reminders WHERE delivered_at IS NOT NULL AND delivered_at < ? LIMIT ?)"
+                " RETURNING user_id",
+                (before_ts, limit),
+            )
+            users = [r[0] for r in cur.fetchall()]
+            self._bump(cur, *users)
+            conn.commit()
+            return len(users)
+
+    # 오래된 발송 선점 기록 삭제 (선점은 발송 직전 중복 방지용이라 며칠 지나면 의미 없음)
+    def purge_claims(self, before_ts: float) -> int:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM dispatch_claims WHERE claimed_at < ?", (before_ts,))
+            conn.commit()
+            return cur.rowcount
+
+    # 빈 페이지 최대 pages 개를 파일에서 반환 + 통계 갱신 → (반환한 페이지 수, 남은 빈 페이지 수)
+    def vacuum(self, pages: int):
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("PRAGMA freelist_count")
+            before = cur.fetchone()[0]
+            # execute 는 한 단계(1페이지)만 실행하므로 executescript 로 끝까지
+            cur.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+            cur.execute("PRAGMA optimize")
+            cur.execute("PRAGMA freelist_count")
+            after = cur.fetchone()[0]
+            return before - after, after
@@ -0,0 +1,468 @@
+"""
+종단 간 부하 테스트: 가짜 Bot API 서버 + 가상 사용자
+
+  python -m benchmarks.loadtest --users 2000 --actions 10 --out results/loadtest.json
+
+1) 표준 라이브러리 asyncio 로 가짜 Telegram Bot API 서버를 띄움
+   (getMe / deleteWebhook / getUpdates / sendMessage / editMessageText / answerCallbackQuery ...)
+2) BOT_API_BASE_URL 을 그 서버로, DATABASE_PATH 를 임시 파일로 지정한 뒤
+   app.main.build_application() 으로 만든 봇을 같은 이벤트 루프에서 폴링 모드로 실행
+3) 가상 사용자마다 닫힌 루프(요청 → 봇 응답 대기 → 생각 시간)로 /add, /list, /today,
+   인라인 버튼(알림 메뉴/알림 설정) 을 섞어 보냄. 응답 기준:
+     - 메시지: 해당 채팅으로 온 첫 sendMessage
+     - 버튼: 해당 채팅의 editMessageText (거절 시 answerCallbackQuery 의 안내 문구)
+4) 사용자 단계가 끝나면 디스패처에 적재된 알림을 모두 '지금'으로 당겨 발송시키고
+   Outbox 를 거쳐 도착한 알림 메시지 수/지연을 측정
+5) 처리량, 동작별 p50/p90/p99, 오류(타임아웃/거절) 수, Bot API 메서드별 호출 수,
+   최대 RSS 를 JSON 으로 저장 → 버전 간 diff 용
+
+- OPENAI_API_KEY 는 비워 규칙 파서(KDateParser)로 동작 (LLM 지연 제외)
+- 최대 RSS 는 같은 프로세스의 부하 생성기를 포함한 값
+- 유입 제한/발송 속도 제한은 기본적으로 운영 설정 그대로, --no-limits 로 해제
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlsplit
+
+TOKEN = "123456:LOADTEST"
+BOT_USER = {"id": 123456, "is_bot": True, "first_name": "loadtest", "username": "loadtest_bot"}
+USER_BASE = 10_000_000
+
+
+def _pct(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * p))]
+
+
+def _summary(vals):
+    s = sorted(vals)
+    return {
+        "count": len(s),
+        "p50_ms": round(_pct(s, .5) * 1e3, 2),
+        "p90_ms": round(_pct(s, .9) * 1e3, 2),
+        "p99_ms": round(_pct(s, .99) * 1e3, 2),
+        "max_ms": round(s[-1] * 1e3, 2) if s else 0.0,
+    }
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ====== 가짜 Bot API ======
+class FakeBotAPI:
+    """
+    HTTP/1.1 keep-alive 를 지원하는 최소 Bot API 서버
+
+    - 요청 본문: PTB 는 form-urlencoded(값은 JSON 문자열) 로 보내므로 값마다 json.loads 시도
+    - getUpdates: offset 이전 업데이트를 버리고, 없으면 timeout 까지 대기 (long polling)
+    - 봇이 보낸 메시지는 on_bot_call(method, params) 로 부하 생성기에 전달
+    """
+
+    def __init__(self, on_bot_call=None):
+        self.on_bot_call = on_bot_call
+        self.calls = defaultdict(int)
+        self.errors = 0
+        self._updates = []
+        self._have_updates = asyncio.Event()
+        self._message_ids = itertools.count(1_000_000)
+        self._server = None
+        self.port = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def push_update(self, update: dict):
+        self._updates.append(update)
+        self._have_updates.set()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                _verb, target, _ = line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b""):
+                        break
+                    k, _, v = h.decode().partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+                method = urlsplit(target).path.rsplit("/", 1)[-1]
+                params = self._params(headers.get("content-type", ""), body)
+                result = await self._dispatch(method, params)
+                payload = json.dumps({"ok": True, "result": result}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # 클라이언트 종료 / 서버 종료 시 대기 중이던 long polling
+        except Exception:
+            self.errors += 1
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _params(content_type: str, body: bytes) -> dict:
+        if not body:
+            return {}
+        if content_type.startswith("application/json"):
+            return json.loads(body)
+        params = {}
+        for k, v in parse_qsl(body.decode(), keep_blank_values=True):
+            try:
+                params[k] = json.loads(v)
+            except ValueError:
+                params[k] = v
+        return params
+
+    def _message(self, params: dict, message_id=None) -> dict:
+        chat_id = int(params.get("chat_id", 0))
+        msg = {
+            "message_id": message_id or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": str(params.get("text", "")),
+        }
+        if params.get("reply_markup"):
+            msg["reply_markup"] = params["reply_markup"]
+        return msg
+
+    async def _dispatch(self, method: str, params: dict):
+        self.calls[method] += 1
+        if method == "getMe":
+            return BOT_USER
+        if method == "getUpdates":
+            return await self._get_updates(params)
+        if method == "sendMessage":
+            msg = self._message(params)
+            self._notify(method, params, msg)
+            return msg
+        if method in ("editMessageText", "editMessageReplyMarkup"):
+            msg = self._message(params, message_id=int(params.get("message_id", 0)))
+            self._notify(method, params, msg)
+            return msg
+        if method == "answerCallbackQuery":
+            self._notify(method, params, None)
+            return True
+        return True
+
+    def _notify(self, method: str, params: dict, msg):
+        if self.on_bot_call is not None:
+            self.on_bot_call(method, params, msg)
+
+    async def _get_updates(self, params: dict):
+        offset = int(params.get("offset", 0) or 0)
+        limit = int(params.get("limit", 100) or 100)
+        timeout = float(params.get("timeout", 0) or 0)
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._have_updates.clear()
+            try:
+                await asyncio.wait_for(self._have_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._updates[:limit]
+
+
+# ====== 가상 사용자 ======
+class LoadGenerator:
+    def __init__(self, args, api: FakeBotAPI, cb, reject_text: str):
+        self.args = args
+        self.cb = cb
+        self.reject_text = reject_text
+        self.api = api
+        api.on_bot_call = self._on_bot_call
+        self._update_ids = itertools.count(1)
+        self._query_ids = itertools.count(1)
+        self._waiting = {}      # chat_id → (kind, future)
+        self._keyboards = {}    # chat_id → (message_id, [callback_data])
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        self.reminder_pushed_at = None
+        self.reminder_latencies = []
+        self.reminders_delivered = 0
+
+    # ------------------------------ 봇 → 서버 ------------------------------
+
+    def _on_bot_call(self, method: str, params: dict, msg):
+        chat_id = int(params.get("chat_id", 0) or 0)
+        text = str(params.get("text", ""))
+        if method == "sendMessage" and text.startswith("🔔"):
+            # 알림은 Outbox 가 같은 분의 메시지를 합쳐 보낼 수 있음
+            n = sum(1 for line in text.splitlines() if line.startswith("🔔"))
+            self.reminders_delivered += n
+            if self.reminder_pushed_at is not None:
+                self.reminder_latencies.extend([time.perf_counter() - self.reminder_pushed_at] * n)
+            return
+        if msg is not None:
+            buttons = [
+                b["callback_data"]
+                for row in (msg.get("reply_markup") or {}).get("inline_keyboard", [])
+                for b in row if "callback_data" in b
+            ]
+            if buttons:
+                self._keyboards[chat_id] = (msg["message_id"], buttons)
+
+        if method == "answerCallbackQuery":
+            if params.get("text") != self.reject_text:
+                return
+            chat_id = int(str(params["callback_query_id"]).split(":")[0])
+        waiting = self._waiting.get(chat_id)
+        if waiting is None:
+            return
+        kind, fut = waiting
+        if method == "sendMessage" and kind == "callback":
+            return  # 버튼 응답은 edit 로 판정
+        if not fut.done():
+            rejected = text == self.reject_text or params.get("text") == self.reject_text
+            fut.set_result("rejected" if rejected else "ok")
+
+    # ------------------------------ 서버 → 봇 ------------------------------
+
+    def _user(self, uid: int) -> dict:
+        return {"id": uid, "is_bot": False, "first_name": f"u{uid}"}
+
+    def _send_text(self, uid: int, text: str):
+        entities = []
+        if text.startswith("/"):
+            entities = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        update_id = next(self._update_ids)
+        self.api.push_update({
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": uid, "type": "private"},
+                "from": self._user(uid),
+                "text": text,
+                "entities": entities,
+            },
+        })
+
+    def _press(self, uid: int, message_id: int, data: str):
+        self.api.push_update({
+            "update_id": next(self._update_ids),
+            "callback_query": {
+                "id": f"{uid}:{next(self._query_ids)}",
+                "from": self._user(uid),
+                "chat_instance": str(uid),
+                "data": data,
+                "message": {
+                    "message_id": message_id,
+                    "date": int(time.time()),
+                    "chat": {"id": uid, "type": "private"},
+                    "from": BOT_USER,
+                    "text": "-",
+                },
+            },
+        })
+
+    def _pick_button(self, uid: int):
+        """알림 설정(rset) > 알림 메뉴(rmenu) > 상세(view) 순으로 누를 버튼 선택"""
+        kb = self._keyboards.get(uid)
+        if kb is None:
+            return None
+        message_id, buttons = kb
+        by_action = {}
+        for data in buttons:
+            try:
+                action, _ = self.cb.decode(data)
+            except ValueError:
+                continue
+            by_action.setdefault(action, []).append(data)
+        for action in (self.cb.RSET, self.cb.RMENU, self.cb.VIEW):
+            if by_action.get(action):
+                return action, message_id, random.choice(by_action[action])
+        return None
+
+    async def _act(self, uid: int, kind: str, fire):
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting[uid] = ("callback" if kind.startswith("cb:") else "message", fut)
+        t0 = time.perf_counter()
+        fire()
+        try:
+            outcome = await asyncio.wait_for(fut, self.args.timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        finally:
+            self._waiting.pop(uid, None)
+        self.outcomes[kind][outcome] += 1
+        if outcome != "timeout":
+            self.latencies[kind].append(time.perf_counter() - t0)
+
+    async def _user_loop(self, uid: int, rng: random.Random):
+        for i in range(self.args.actions):
+            # 30% /add, 20% /list, 10% /today, 40% 버튼 (누를 버튼이 없으면 /list)
+            r = rng.random()
+            button = self._pick_button(uid) if r >= 0.6 else None
+            if r < 0.3:
+                text = f"/add 내일 오후 {rng.randint(1, 11)}시 부하테스트 {i}"
+                await self._act(uid, "/add", lambda: self._send_text(uid, text))
+            elif button is not None:
+                action, message_id, data = button
+                await self._act(uid, f"cb:{action}", lambda: self._press(uid, message_id, data))
+            elif r < 0.5 or r >= 0.6:
+                await self._act(uid, "/list", lambda: self._send_text(uid, "/list"))
+            else:
+                await self._act(uid, "/today", lambda: self._send_text(uid, "/today"))
+            if self.args.think_ms:
+                await asyncio.sleep(rng.random() * self.args.think_ms / 1000)
+
+    async def run_users(self):
+        rng = random.Random(self.args.seed)
+        seeds = [rng.random() for _ in range(self.args.users)]
+        await asyncio.gather(*[
+            self._user_loop(USER_BASE + n, random.Random(s)) for n, s in enumerate(seeds)
+        ])
+
+    async def fire_reminders(self, app) -> int:
+        """디스패처에 적재된 알림을 모두 지금 발송 시각으로 당김"""
+        svc = app.bot_data["reminder_service"]
+        now = time.time()
+        pushed = 0
+        self.reminder_pushed_at = time.perf_counter()
+        for rid, uid, *_ in svc.repo.list_pending_reminders():
+            if rid in svc.dispatcher:
+                svc.dispatcher.push(rid, uid, now)
+                pushed += 1
+        deadline = time.monotonic() + self.args.reminder_timeout
+        while self.reminders_delivered < pushed and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        return pushed
+
+
+# ====== 실행 ======
+def _configure_env(args, port: int, db_path: str):
+    os.environ.update({
+        "BOT_TOKEN": TOKEN,
+        "BOT_API_BASE_URL": f"http://127.0.0.1:{port}/bot",
+        "DATABASE_PATH": db_path,
+        "OPENAI_API_KEY": "",
+        "METRICS_PORT": "0",
+        "BOT_MODE": "polling",
+        "CONCURRENT_UPDATES": str(args.concurrent_updates),
+        "TEXT_DEBOUNCE_SEC": "0.2",
+    })
+    if args.no_limits:
+        os.environ.update({
+            "ADMIT_LLM": "1e6,1e6,1e6,1e6",
+            "ADMIT_WRITE": "1e6,1e6,1e6,1e6",
+            "ADMIT_READ": "1e6,1e6,1e6,1e6",
+            "SEND_GLOBAL_RATE": "1e6",
+            "SEND_CHAT_RATE": "1e6",
+            "SEND_CHAT_BURST": "1e6",
+        })
+
+
+async def main_async(args) -> dict:
+    # 봇 모듈은 환경 변수를 읽은 뒤에 import (settings 가 import 시점에 결정됨)
+    api = FakeBotAPI()
+    await api.start()
+    tmp = tempfile.TemporaryDirectory()
+    _configure_env(args, api.port, os.path.join(tmp.name, "loadtest.db"))
+
+    from app.bot import callbacks as cb
+    from app.bot.admission import REJECT_TEXT
+    from app.main import build_application
+
+    gen = LoadGenerator(args, api, cb, REJECT_TEXT)
+
+    app = build_application()
+    async with app:
+        await app.start()
+        await app.updater.start_polling(poll_interval=0.0, timeout=1)
+        await asyncio.sleep(args.warmup)  # 샤드 임대/Outbox 시작 대기
+
+        t0 = time.perf_counter()
+        await gen.run_users()
+        user_elapsed = time.perf_counter() - t0
+
+        t1 = time.perf_counter()
+        pushed = await gen.fire_reminders(app)
+        reminder_elapsed = time.perf_counter() - t1
+
+        await app.updater.stop()
+        await app.stop()
+    await api.stop()
+    tmp.cleanup()
+
+    total = sum(sum(o.values()) for o in gen.outcomes.values())
+    actions = {}
+    for kind in sorted(gen.outcomes):
+        actions[kind] = {**_summary(gen.latencies[kind]), **dict(gen.outcomes[kind])}
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "users_phase": {
+            "elapsed_sec": round(user_elapsed, 3),
+            "actions": total,
+            "throughput_per_sec": round(total / user_elapsed, 1) if user_elapsed else 0.0,
+            "by_action": actions,
+            "timeouts": sum(o.get("timeout", 0) for o in gen.outcomes.values()),
+            "rejected": sum(o.get("rejected", 0) for o in gen.outcomes.values()),
+        },
+        "reminders": {
+            "pushed": pushed,
+            "delivered": gen.reminders_delivered,
+            "elapsed_sec": round(reminder_elapsed, 3),
+            **_summary(gen.reminder_latencies),
+        },
+        "bot_api_calls": dict(sorted(api.calls.items())),
+        "fake_api_errors": api.errors,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--actions", type=int, default=10, help="사용자당 동작 수")
+    ap.add_argument("--think-ms", type=float, default=200, help="동작 사이 최대 대기(ms)")
+    ap.add_argument("--timeout", type=float, default=15, help="동작당 응답 대기 한도(초)")
+    ap.add_argument("--reminder-timeout", type=float, default=120)
+    ap.add_argument("--concurrent-updates", type=int, default=32)
+    ap.add_argument("--warmup", type=float, default=2.5)
+    ap.add_argument("--no-limits", action="store_true", help="유입 제한/발송 속도 제한 해제")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", default="loadtest_results.json")
+    args = ap.parse_args()
+
+    result = asyncio.run(main_async(args))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2, sort_keys=True)
+    u = result["users_phase"]
+    print(f"actions: {u['actions']:,} in {u['elapsed_sec']:.2f}s → {u['throughput_per_sec']:,.0f}/s "
+          f"(timeouts {u['timeouts']}, rejected {u['rejected']})")
+    for kind, s in u["by_action"].items():
+        print(f"  {kind:12s} n={s['count']:<7} p50={s['p50_ms']:.1f} p90={s['p90_ms']:.1f} "
+              f"p99={s['p99_ms']:.1f} ms")
+    r = result["reminders"]
+    print(f"reminders: {r['delivered']}/{r['pushed']} delivered in {r['elapsed_sec']:.2f}s "
+          f"(p99 {r['p99_ms']:.0f} ms)")
+    print(f"peak RSS: {result['peak_rss_mb']} MB → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
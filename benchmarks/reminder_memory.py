@@ -0,0 +1,86 @@
+"""
+대기 알림 1건당 메모리 (tracemalloc)
+
+  python -m benchmarks.reminder_memory [N]
+
+before: 예전 _schedule_one 방식 — 알림마다 async 클로저(_send) + lambda + 잡 인자
+        (PTB Job / APScheduler 트리거 객체는 제외한 하한값)
+after : ReminderDispatcher — 알림마다 PendingReminder(__slots__) 한 개
+"""
+import datetime
+import sys
+import tracemalloc
+
+from app.services.dispatcher import ReminderDispatcher
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+BASE_TS = 1_800_000_000
+
+
+class _FakeService:
+    app = None
+    sender = None
+
+
+def _rows(n):
+    for i in range(n):
+        yield (
+            1_000_000 + i,                 # reminder_id
+            10_000_000 + i % 5000,         # user_id
+            f"회의 {i}",                    # title
+            f"2027-01-{1 + i % 28:02d}",   # date
+            f"{i % 24:02d}:{i % 60:02d}",  # time
+        )
+
+
+def _old_job(self, rid, user_id, title, dt_str, tm_str):
+    """예전 _schedule_one이 run_once에 넘기던 것과 같은 모양의 클로저/인자"""
+
+    async def _send(ctx):
+        await self.sender.app.bot.send_message(chat_id=user_id, text=f"{dt_str} {tm_str} {title}")
+
+    return {
+        "callback": lambda ctx: self.app.create_task(_send(ctx)),
+        "when": datetime.datetime.fromtimestamp(BASE_TS + rid, tz=KST),
+        "name": f"reminder:{rid}",
+        "chat_id": user_id,
+    }
+
+
+def _before(n):
+    svc = _FakeService()
+    return [_old_job(svc, *row) for row in _rows(n)]
+
+
+def _after(n):
+    async def _fire(reminder_id, user_id):
+        pass
+
+    d = ReminderDispatcher(_fire)
+    for rid, user_id, _title, _dt, _tm in _rows(n):
+        d.push(rid, user_id, BASE_TS + rid)
+    return d
+
+
+def _measure(fn, n):
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    keep = fn(n)
+    cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return (cur - base) / n, (peak - base) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"pending reminders: {n:,}")
+    before, _ = _measure(_before, n)
+    after, _ = _measure(_after, n)
+    print(f"before (closure + lambda per job): {before:8.1f} B/reminder  ({before * n / 2**20:6.1f} MiB)")
+    print(f"after  (slotted heap record)     : {after:8.1f} B/reminder  ({after * n / 2**20:6.1f} MiB)")
+    print(f"reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+조회 행 생성 벤치마크 (rows/s, 행당 메모리)
+
+  python -m benchmarks.rows [--rows 200000] [--runs 5]
+
+같은 SELECT id,title,description,date,time 결과를 row_factory 별로 fetchall:
+  tuple       = 기본 튜플 (이전 ScheduleRepo 반환값)
+  ScheduleRow = app.storage.rows.schedule_row (현재)
+  sqlite3.Row = 내장 Row
+  pydantic    = 행마다 Schedule 모델 생성 (입력 경계 검증을 읽기 경로에도 쓸 경우)
+- rows/s 는 runs 번 중 최솟값 기준, 메모리는 tracemalloc 으로 잰 행당 증가분 (문자열 포함)
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from app.storage.db import DB
+from app.storage.rows import schedule_row
+
+_SQL = "SELECT id,title,description,date,time FROM schedules WHERE user_id=? ORDER BY date,time"
+
+
+def _pydantic_row():
+    from app.domain.schedule import Schedule
+
+    def factory(cursor, row):
+        return Schedule(title=row[1], description=row[2], date=row[3], time=row[4])
+    return factory
+
+
+def _fill(db: DB, n: int):
+    with db.connect() as conn:
+        conn.executemany(
+            "INSERT INTO schedules(user_id,title,description,date,time) VALUES(?,?,?,?,?)",
+            (
+                (1, f"일정 {i}", "", f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                 None if i % 5 == 0 else f"{i % 24:02d}:{i % 4 * 15:02d}")
+                for i in range(n)
+            ),
+        )
+        conn.commit()
+
+
+def _fetch(conn: sqlite3.Connection, factory):
+    cur = conn.cursor()
+    cur.row_factory = factory
+    cur.execute(_SQL, (1,))
+    return cur.fetchall()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(os.path.join(tmp, "bench.db"))
+        _fill(db, args.rows)
+        conn = db.connect()
+        cases = {
+            "tuple": None,
+            "ScheduleRow": schedule_row,
+            "sqlite3.Row": sqlite3.Row,
+            "pydantic": _pydantic_row(),
+        }
+        print(f"{args.rows} rows, best of {args.runs}")
+        base = None
+        for name, factory in cases.items():
+            best = float("inf")
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                _fetch(conn, factory)
+                best = min(best, time.perf_counter() - t0)
+            tracemalloc.start()
+            rows = _fetch(conn, factory)
+            per_row = tracemalloc.get_traced_memory()[0] / len(rows)
+            tracemalloc.stop()
+            del rows
+            base = base or best
+            print(f"  {name:<12} {args.rows / best:>12,.0f} rows/s  x{base / best:4.2f}  {per_row:6.0f} B/row")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+기동 시간 벤치마크 (python -X importtime)
+
+  python -m benchmarks.startup [--module app.main] [--budget-ms 600] [--runs 3] [--top 15]
+
+- 새 인터프리터에서 `import <module>` 을 runs 번 실행해 importtime 누적값(µs)의 최솟값을 사용
+  (디스크 캐시/바이트코드 컴파일 영향 제거)
+- 모듈 최상위에서 import 되는 무거운 패키지 상위 top 개를 출력
+- 전체가 budget-ms 를 넘으면 종료 코드 1 → CI 에서 기동 시간 회귀 감지용
+  (openai/numpy/pydantic 은 첫 사용 시 import 되므로 여기에 나오면 회귀)
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+def _importtime(module: str) -> List[Tuple[int, int, int, str]]:
+    """[(self_us, cumulative_us, depth, name)]"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cum_us, raw_name = line.split("|", 2)
+        self_us = int(head.rsplit(":", 1)[1])
+        # 이름 앞 공백: 1칸 + 중첩 깊이당 2칸
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        rows.append((self_us, int(cum_us), depth, raw_name.strip()))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--module", default="app.main")
+    ap.add_argument("--budget-ms", type=float, default=600.0)
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        rows = _importtime(args.module)
+        total = next(cum for _s, cum, d, name in reversed(rows) if name == args.module and d == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total_us, rows = best
+
+    # 대상 모듈이 직접 import 한(깊이 1) 모듈별 누적 시간. importtime 은 자식이 부모보다 먼저 출력됨
+    end = max(i for i, r in enumerate(rows) if r[3] == args.module and r[2] == 0)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    heavy: Dict[str, int] = {}
+    for _self, cum, depth, name in rows[start:end]:
+        if depth == 1:
+            heavy[name] = max(heavy.get(name, 0), cum)
+    print(f"import {args.module}: {total_us / 1000:.1f} ms (best of {args.runs})")
+    for name, cum in sorted(heavy.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {cum / 1000:8.1f} ms  {name}")
+
+    if total_us / 1000 > args.budget_ms:
+        print(f"FAIL: budget {args.budget_ms:.0f} ms exceeded")
+        sys.exit(1)
+    print(f"OK: within budget {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
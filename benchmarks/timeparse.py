@@ -0,0 +1,95 @@
+"""
+날짜/시간 처리 벤치마크 (strptime 기반 이전 방식 vs timeutil)
+
+  python -m benchmarks.timeparse [--rows 100000] [--runs 5]
+
+- restore: 알림 rows 개의 발송 시각 계산
+    legacy   = 행마다 strptime + timedelta + timestamp()  (이전 _fire_ts)
+    kst_epoch= timeutil.kst_epoch (정수 산술, 날짜 파싱은 lru_cache)
+    fire_at  = DB에 저장된 epoch 사용 (현재 _load_pending 경로, 비교만)
+- validate: 날짜/시간 문자열 검증 (이전 Schedule 검증기의 strptime vs parse_ymd/parse_hm)
+- 각 항목은 runs 번 중 최솟값, 결과는 rows/s
+"""
+import argparse
+import datetime
+import random
+import time
+
+from app.services.timeutil import kst_epoch, parse_hm, parse_ymd
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+
+def _legacy_fire_ts(dt_str, tm_str, offset_minutes):
+    if tm_str:
+        hh, mm = map(int, tm_str.split(":"))
+    else:
+        hh, mm = 9, 0
+    event_dt = datetime.datetime.strptime(f"{dt_str} {hh:02d}:{mm:02d}", "%Y-%m-%d %H:%M")
+    event_dt = event_dt.replace(tzinfo=KST)
+    return int((event_dt - datetime.timedelta(minutes=offset_minutes)).timestamp())
+
+
+def _legacy_validate(dt_str, tm_str):
+    datetime.datetime.strptime(dt_str, "%Y-%m-%d")
+    if tm_str is not None:
+        datetime.datetime.strptime(tm_str, "%H:%M")
+
+
+def _validate(dt_str, tm_str):
+    parse_ymd(dt_str)
+    if tm_str is not None:
+        parse_hm(tm_str)
+
+
+def _rows(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    today = datetime.date.today()
+    rows = []
+    for rid in range(1, n + 1):
+        d = (today + datetime.timedelta(days=rnd.randint(0, 365))).isoformat()
+        t = None if rnd.random() < 0.2 else f"{rnd.randint(0, 23):02d}:{rnd.choice((0, 15, 30, 45)):02d}"
+        off = rnd.choice((0, 30, 60, 1440))
+        rows.append((rid, rnd.randint(1, 1000), _legacy_fire_ts(d, t, off), off, d, t))
+    return rows
+
+
+def _best(fn, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        parse_ymd.cache_clear()  # 실행마다 캐시가 비어 있는 상태(재시작 직후)에서 측정
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    rows = _rows(args.rows)
+    now = time.time()
+    for _rid, _uid, fire_at, off, d, t in rows[:1000]:
+        assert kst_epoch(d, t, off) == fire_at
+
+    cases = {
+        "restore/legacy": lambda: [_legacy_fire_ts(d, t, o) > now for _r, _u, _f, o, d, t in rows],
+        "restore/kst_epoch": lambda: [kst_epoch(d, t, o) > now for _r, _u, _f, o, d, t in rows],
+        "restore/fire_at": lambda: [f > now for _r, _u, f, _o, _d, _t in rows],
+        "validate/legacy": lambda: [_legacy_validate(d, t) for *_x, d, t in rows],
+        "validate/timeutil": lambda: [_validate(d, t) for *_x, d, t in rows],
+    }
+    base = {}
+    print(f"{args.rows} rows, best of {args.runs}")
+    for name, fn in cases.items():
+        sec = _best(fn, args.runs)
+        group = name.split("/")[0]
+        base.setdefault(group, sec)
+        print(f"  {name:<20} {args.rows / sec:>12,.0f} rows/s  x{base[group] / sec:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+웹훅 부하 생성기: 합성 업데이트를 POST 하여 초당 처리량(updates/sec) 측정
+
+  BOT_MODE=webhook 으로 봇 실행 후
+  python -m benchmarks.webhook_load --url http://127.0.0.1:8443/telegram --secret $WEBHOOK_SECRET \
+      --updates 20000 --concurrency 64 --users 1000 --text /today
+
+- 표준 라이브러리 asyncio 스트림으로 HTTP/1.1 keep-alive 연결을 concurrency 개 열어 순차 전송
+- 응답 200 까지의 지연 시간 분포(p50/p90/p99)와 전체 처리량을 출력
+- 봇이 응답으로 보내는 sendMessage 는 Bot API 로 나가므로, 순수 수신 처리량을 재려면
+  봇을 가짜 Bot API(benchmarks.loadtest) 에 연결해 두는 것을 권장
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from urllib.parse import urlsplit
+
+
+def _update(update_id: int, user_id: int, text: str) -> bytes:
+    now = int(time.time())
+    return json.dumps({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": now,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"u{user_id}"},
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+            if text.startswith("/") else [],
+        },
+    }).encode()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        k, _, v = line.decode().partition(":")
+        if k.lower() == "content-length":
+            length = int(v.strip())
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _worker(url, secret, ids, users, text, latencies, errors):
+    u = urlsplit(url)
+    reader, writer = await asyncio.open_connection(u.hostname, u.port or 80)
+    head = (
+        f"POST {u.path or '/'} HTTP/1.1\r\n"
+        f"Host: {u.netloc}\r\n"
+        "Content-Type: application/json\r\n"
+        f"X-Telegram-Bot-Api-Secret-Token: {secret}\r\n"
+    )
+    try:
+        for update_id in ids:
+            body = _update(update_id, 100000 + update_id % users, text)
+            t0 = time.perf_counter()
+            writer.write(f"{head}Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def _pct(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * p))]
+
+
+async def main_async(args):
+    counter = itertools.count(1)
+    latencies, errors = [], {}
+
+    def ids():
+        for update_id in counter:
+            if update_id > args.updates:
+                return
+            yield update_id
+
+    shared = ids()
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(args.url, args.secret, shared, args.users, args.text, latencies, errors)
+        for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    print(f"updates: {len(lat):,} in {elapsed:.2f}s → {len(lat) / elapsed:,.0f} updates/sec")
+    print(f"latency ms: p50={_pct(lat, .5) * 1e3:.1f} p90={_pct(lat, .9) * 1e3:.1f} "
+          f"p99={_pct(lat, .99) * 1e3:.1f} max={lat[-1] * 1e3 if lat else 0:.1f}")
+    if errors:
+        print(f"non-200 responses: {errors}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8443/telegram")
+    ap.add_argument("--secret", required=True)
+    ap.add_argument("--updates", type=int, default=10000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--text", default="/today")
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()